@@ -7,11 +7,12 @@
 # Last Modified Date:  09.05.2020
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
+from collections.abc import Sequence
 from typing import Any
 
 from ampel.base.AmpelABC import AmpelABC
 from ampel.base.AmpelBaseModel import AmpelBaseModel
-from ampel.base.decorator import abstractmethod
+from ampel.base.decorator import abstractmethod, defaultmethod
 
 
 class AbsApplicable(AmpelABC, AmpelBaseModel, abstract=True):
@@ -19,3 +20,16 @@ class AbsApplicable(AmpelABC, AmpelBaseModel, abstract=True):
 	@abstractmethod
 	def apply(self, arg: Any) -> Any:
 		...
+
+
+	@defaultmethod
+	def apply_many(self, args: Sequence[Any]) -> list[Any]:
+		"""
+		Applies this unit to several arguments (ex: the datapoints of each stock of an ingestion batch).
+		The default implementation calls apply() for each argument.
+		Units can override this method to evaluate all arguments at once
+		(ex: tag based filters using ampel.util.tag.DataPointTagIndex).
+
+		:returns: one result per argument, in the order of the provided arguments
+		"""
+		return [self.apply(arg) for arg in args]
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/abstract/AbsAsyncT3Unit.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from typing import Generic, TypeVar
+
+from ampel.base.decorator import abstractmethod
+from ampel.base.LogicalUnit import LogicalUnit
+from ampel.struct.T3Store import T3Store
+from ampel.struct.UnitResult import UnitResult
+from ampel.types import UBson
+from ampel.util.aio import AsyncViewStream
+from ampel.view.SnapView import SnapView
+
+T = TypeVar("T", bound=SnapView)
+
+
+class AbsAsyncT3Unit(LogicalUnit, Generic[T], abstract=True):
+	"""
+	Asyncio-native variant of AbsT3Unit for units performing I/O bound operations
+	(ex: publishing to external endpoints, querying catalogs) which can be overlapped across stocks
+	(see ampel.util.aio.bounded_map).
+	"""
+
+	# avoid introspection at run-time
+	_View: type[T] = SnapView # type: ignore[assignment]
+
+	@abstractmethod
+	async def process(self,
+		views: AsyncViewStream[T],
+		t3s: T3Store
+	) -> UBson | UnitResult:
+		"""
+		T3 units receive SnapView instances (or subclasses of) via an async iterator.
+		The method views.send(...) has the same semantics as gen.send(...) in AbsT3Unit.process:
+		it applies a modification to the last view yielded unless a stock id is provided via a tuple.
+		Concurrent tasks (ex: coroutines run by bounded_map) must use the tuple form (stock id, StockAttributes).
+		"""
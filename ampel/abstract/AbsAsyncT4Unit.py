@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/abstract/AbsAsyncT4Unit.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from ampel.base.decorator import abstractmethod
+from ampel.base.LogicalUnit import LogicalUnit
+from ampel.struct.UnitResult import UnitResult
+from ampel.types import UBson
+
+
+class AbsAsyncT4Unit(LogicalUnit, abstract=True):
+	""" Asyncio-native variant of AbsT4Unit """
+
+	@abstractmethod
+	async def do(self) -> UBson | UnitResult:
+		...
@@ -7,15 +7,26 @@
 # Last Modified Date:  12.02.2021
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
+from collections.abc import Sequence
 from typing import overload
 
 from ampel.base.AmpelABC import AmpelABC
 from ampel.base.AmpelBaseModel import AmpelBaseModel
-from ampel.base.decorator import abstractmethod
+from ampel.base.decorator import abstractmethod, defaultmethod
 from ampel.types import StockId, StrictIterable
 
 
 class AbsIdMapper(AmpelABC, AmpelBaseModel, abstract=True):
+	"""
+	Converts external (ex: survey) names into ampel stock ids and vice versa.
+
+	Batch conversions (ex: T3 exports) should use to_ampel_ids / to_ext_ids,
+	which pass the values as a list to to_ampel_id / to_ext_id.
+	Implementations should thus vectorize the StrictIterable code path of these methods when possible.
+	Mappers with costly conversions (ex: lookups) can override the batch methods to convert
+	distinct values only (see ampel.util.idmapping.map_distinct) or use ampel.util.idmapping.IdMapperCache.
+	See also benchmarks/bench_idmapper.py
+	"""
 
 	@overload
 	@classmethod
@@ -46,3 +57,17 @@ class AbsIdMapper(AmpelABC, AmpelBaseModel, abstract=True):
 	@abstractmethod
 	def to_ext_id(cls, ampel_id: StockId | StrictIterable[StockId]) -> str | list[str]:
 		...
+
+
+	@defaultmethod
+	@classmethod
+	def to_ampel_ids(cls, ext_ids: Sequence[str]) -> list[int]:
+		""" :returns: ampel ids in the order of the provided external ids """
+		return cls.to_ampel_id(list(ext_ids))
+
+
+	@defaultmethod
+	@classmethod
+	def to_ext_ids(cls, ampel_ids: Sequence[StockId]) -> list[str]:
+		""" :returns: external ids in the order of the provided ampel ids """
+		return cls.to_ext_id(list(ampel_ids))
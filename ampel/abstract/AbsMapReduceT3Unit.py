@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/abstract/AbsMapReduceT3Unit.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from collections import deque
+from collections.abc import Generator, Iterator, Sequence
+from concurrent.futures import Executor, Future
+from itertools import islice
+from typing import Any, Generic, TypeVar
+
+from ampel.abstract.AbsT3Unit import AbsT3Unit
+from ampel.base.decorator import abstractmethod, defaultmethod
+from ampel.struct.JournalAttributes import JournalAttributes
+from ampel.struct.StockAttributes import StockAttributes
+from ampel.struct.T3Store import T3Store
+from ampel.struct.UnitResult import UnitResult
+from ampel.types import T3Send, UBson
+from ampel.view.SnapView import SnapView
+
+T = TypeVar("T", bound=SnapView)
+
+#: Partial result of a view and optional feedback regarding the stock of the view
+MapResult = tuple[Any, None | JournalAttributes | StockAttributes]
+
+
+class AbsMapReduceT3Unit(AbsT3Unit[T], Generic[T], abstract=True):
+	"""
+	T3 unit variant processing views independently of each other (map)
+	before combining the partial results (reduce), allowing views to be processed
+	in chunks by several threads or processes.
+
+	Journal or stock attribute updates returned by map are applied to the stock of the mapped view,
+	exactly like gen.send((view.id, StockAttributes(...))) would in the process method of a regular T3 unit.
+	Updates are sent and partial results are passed to reduce in the order of the views.
+
+	Notes regarding parallel processing (see process_parallel):
+	- map must not rely on state modified by other map calls
+	- when using a process pool, the unit (including its logger) as well as views, t3 store
+	  and partial results must be picklable. The t3 store is pickled with every chunk:
+	  units working with large stores should rather increase chunk_size
+	  or load their views via ampel.struct.T3StoreSnapshot
+	"""
+
+	#: Number of views per map task
+	chunk_size: int = 100
+
+	#: Max number of pending chunks in parallel mode (0: twice the number of workers if available, 16 otherwise)
+	max_pending: int = 0
+
+
+	@abstractmethod
+	def map(self, view: T, t3s: T3Store) -> MapResult:
+		"""
+		:returns: a tuple (partial result, optional JournalAttributes or StockAttributes for the stock of the view)
+		"""
+
+
+	@abstractmethod
+	def reduce(self, partials: list[Any], t3s: T3Store) -> UBson | UnitResult:
+		"""
+		:param partials: partial results returned by map (in the order of the views)
+		"""
+
+
+	@defaultmethod
+	def map_chunk(self, views: Sequence[T], t3s: T3Store) -> list[MapResult]:
+		"""
+		Maps a chunk of views. The default implementation calls map() for each view.
+		Units able to vectorize computations across views can override this method.
+		"""
+		return [self.map(view, t3s) for view in views]
+
+
+	def process(self,
+		gen: Generator[T, T3Send, None],
+		t3s: T3Store
+	) -> UBson | UnitResult:
+		""" Sequential implementation (same semantics as process_parallel) """
+		partials: list[Any] = []
+		for chunk in _chunks(gen, self.chunk_size):
+			self._collect(gen, chunk, self.map_chunk(chunk, t3s), partials)
+		return self.reduce(partials, t3s)
+
+
+	def process_parallel(self,
+		gen: Generator[T, T3Send, None],
+		t3s: T3Store,
+		executor: Executor
+	) -> UBson | UnitResult:
+		"""
+		Fans chunks of views out to the provided executor (ex: ProcessPoolExecutor)
+		while a bounded number of chunks are pending, then reduces the partial results.
+		"""
+
+		if not (max_pending := self.max_pending):
+			max_pending = 2 * n if (n := getattr(executor, '_max_workers', 0)) else 16
+
+		partials: list[Any] = []
+		pending: deque[tuple[list[T], Future[list[MapResult]]]] = deque()
+
+		for chunk in _chunks(gen, self.chunk_size):
+			if len(pending) >= max_pending:
+				views, fut = pending.popleft()
+				self._collect(gen, views, fut.result(), partials)
+			pending.append((chunk, executor.submit(_map_chunk, self, chunk, t3s)))
+
+		while pending:
+			views, fut = pending.popleft()
+			self._collect(gen, views, fut.result(), partials)
+
+		return self.reduce(partials, t3s)
+
+
+	def _collect(self,
+		gen: Generator[T, T3Send, None],
+		views: Sequence[T],
+		results: list[MapResult],
+		partials: list[Any]
+	) -> None:
+
+		if len(results) != len(views):
+			raise ValueError(f"map_chunk returned {len(results)} results for {len(views)} views")
+
+		for view, (partial, update) in zip(views, results, strict=True):
+			partials.append(partial)
+			if update is not None:
+				gen.send(
+					(view.id, update if isinstance(update, StockAttributes) else StockAttributes(journal=update))
+				)
+
+
+def _map_chunk(unit: AbsMapReduceT3Unit, views: list[Any], t3s: T3Store) -> list[MapResult]:
+	return unit.map_chunk(views, t3s)
+
+
+def _chunks(it: Iterator[T], size: int) -> Iterator[list[T]]:
+	while chunk := list(islice(it, size)):
+		yield chunk
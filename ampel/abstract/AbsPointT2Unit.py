@@ -7,7 +7,9 @@
 # Last Modified Date:  02.11.2025
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
-from ampel.base.decorator import abstractmethod
+from collections.abc import Sequence
+
+from ampel.base.decorator import abstractmethod, defaultmethod
 from ampel.base.LogicalUnit import LogicalUnit
 from ampel.content.DataPoint import DataPoint
 from ampel.struct.UnitResult import UnitResult
@@ -52,3 +54,16 @@ class AbsPointT2Unit(LogicalUnit, abstract=True):
 
 		.. note:: the returned dict must have only string keys and be BSON-encodable
 		"""
+
+
+	@defaultmethod
+	def process_batch(self, datapoints: Sequence[DataPoint]) -> list[UBson | UnitResult]:
+		"""
+		Processes several datapoints at once.
+		The default implementation calls process() for each datapoint.
+		Units performing vectorizable computations (ex: photometric conversions, cross-matches)
+		can override this method to process all datapoints in one go (ex: using numpy).
+
+		:returns: one result per datapoint, in the order of the provided datapoints
+		"""
+		return [self.process(dp) for dp in datapoints]
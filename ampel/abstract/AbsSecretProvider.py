@@ -7,8 +7,10 @@
 # Last Modified Date:  21.06.2021
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
+from collections.abc import Sequence
+
 from ampel.base.AmpelABC import AmpelABC
-from ampel.base.decorator import abstractmethod
+from ampel.base.decorator import abstractmethod, defaultmethod
 from ampel.secret.Secret import Secret
 
 
@@ -28,3 +30,15 @@ class AbsSecretProvider(AmpelABC, abstract=True):
 		if the provided Secret is either unknown to this secret
 		provider, or resolves to a value of the wrong type.
 		"""
+
+
+	@defaultmethod
+	def tell_many(self, args: Sequence[Secret], ValueType: type) -> list[bool]:
+		"""
+		Batch version of tell, used by AmpelVault.prefetch.
+		The default implementation calls tell() for each secret.
+		Providers with expensive lookups (ex: file reads, decryption, remote calls)
+		can override this method to resolve all secrets at once.
+		:returns: one boolean per secret (see tell)
+		"""
+		return [self.tell(secret, ValueType) for secret in args]
@@ -7,9 +7,9 @@
 # Last Modified Date:  01.11.2025
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 
-from ampel.base.decorator import abstractmethod
+from ampel.base.decorator import abstractmethod, defaultmethod
 from ampel.base.LogicalUnit import LogicalUnit
 from ampel.content.DataPoint import DataPoint
 from ampel.content.T1Document import T1Document
@@ -29,3 +29,28 @@ class AbsStateT2Unit(LogicalUnit, abstract=True):
 
 		.. note:: the returned dict must have only string keys and be BSON-encodable
 		"""
+
+
+	@defaultmethod
+	def process_many(self,
+		states: Sequence[tuple[T1Document, Iterable[DataPoint]]]
+	) -> list[UBson | UnitResult | Exception]:
+		"""
+		Processes several states at once, allowing units with expensive setup
+		(model initialization, JIT compilation) to amortize it over many states.
+		The default implementation calls process() for each (compound, datapoints) tuple.
+
+		Error isolation: an exception raised while processing a given state must not fail the batch.
+		The exception is instead returned at the position of the state, and handled by the caller
+		as if process() had raised it for this state. Other results are unaffected.
+		Exceptions raised by process_many itself concern the whole batch.
+
+		:returns: one result (or exception) per state, in the order of the provided states
+		"""
+		ret: list[UBson | UnitResult | Exception] = []
+		for compound, datapoints in states:
+			try:
+				ret.append(self.process(compound, datapoints))
+			except Exception as e: # noqa: PERF203
+				ret.append(e)
+		return ret
@@ -7,8 +7,9 @@
 # Last Modified Date:  01.11.2025
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
+from collections.abc import Sequence
 from typing import Any
-from ampel.base.decorator import abstractmethod
+from ampel.base.decorator import abstractmethod, defaultmethod
 from ampel.base.LogicalUnit import LogicalUnit
 from ampel.content.DataPoint import DataPoint
 from ampel.types import StockId
@@ -45,3 +46,39 @@ class AbsT0Unit(LogicalUnit, abstract=True):
 		Returns:
 			list[DataPoint]: A list of Ampel-compatible datapoints derived from the input.
 		"""
+
+
+	@defaultmethod
+	def process_batch(self,
+		args: Sequence[Any],
+		stocks: None | Sequence[None | StockId] = None
+	) -> tuple[list[DataPoint], list[int]]:
+		"""
+		Transforms several external objects at once.
+		The default implementation calls process() for each input.
+		Shapers able to operate on columnar batches (ex: alert batches decoded into arrays)
+		can override this method to derive ids and tags for all inputs in one go.
+
+		Parameters:
+			args (Sequence[Any]): The external input objects to be converted.
+			stocks (None | Sequence[None | StockId]): Optional stock identifiers,
+			one per input object (same length as args).
+
+		Returns:
+			tuple[list[DataPoint], list[int]]: the flattened list of datapoints derived from all inputs
+			and offsets (of length len(args) + 1) such that the datapoints derived from args[i]
+			are located in the range [offsets[i], offsets[i+1]).
+
+		In []: dps, offsets = shaper.process_batch([alert1, alert2], [stock1, stock2])
+		In []: dps[offsets[1]:offsets[2]] # datapoints of alert2
+		"""
+		if stocks is not None and len(stocks) != len(args):
+			raise ValueError("Parameters 'args' and 'stocks' must have the same length")
+
+		dps: list[DataPoint] = []
+		offsets = [0]
+		for i, arg in enumerate(args):
+			dps.extend(self.process(arg, None if stocks is None else stocks[i]))
+			offsets.append(len(dps))
+
+		return dps, offsets
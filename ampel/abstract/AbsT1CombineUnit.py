@@ -7,9 +7,9 @@
 # Last Modified Date:  14.06.2021
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 
-from ampel.base.decorator import abstractmethod
+from ampel.base.decorator import abstractmethod, defaultmethod
 from ampel.base.LogicalUnit import LogicalUnit
 from ampel.content.DataPoint import DataPoint
 from ampel.struct.T1CombineResult import T1CombineResult
@@ -17,7 +17,14 @@ from ampel.types import ChannelId, DataPointId
 
 
 class AbsT1CombineUnit(LogicalUnit, abstract=True):
-	""" A unit that combines datapoints """
+	"""
+	A unit that combines datapoints.
+
+	Units whose result can be derived from a previous result and the newly added datapoints
+	(ex: units selecting every datapoint matching a given criteria) can implement combine_incremental
+	to avoid re-examining the full datapoint history of a stock for each new alert.
+	The framework should use combine_or_extend which falls back to combine when necessary.
+	"""
 
 	debug: bool = False
 	access: Sequence[int | str] = []
@@ -27,3 +34,38 @@ class AbsT1CombineUnit(LogicalUnit, abstract=True):
 	@abstractmethod
 	def combine(self, datapoints: Iterable[DataPoint]) -> Sequence[DataPointId] | T1CombineResult:
 		...
+
+
+	@defaultmethod
+	def combine_incremental(self,
+		previous: Sequence[DataPointId] | T1CombineResult,
+		datapoints: Iterable[DataPoint]
+	) -> None | Sequence[DataPointId] | T1CombineResult:
+		"""
+		:param previous: result of a previous combine (or combine_incremental) call
+		for the same stock, that is: based on the datapoint history minus the provided datapoints
+		:param datapoints: datapoints added since the previous result was computed
+		:returns: the updated result or None if it cannot be derived incrementally
+		(in which case combine will be called with the full datapoint history).
+		The link of the corresponding T1 document is computed from the returned datapoint ids
+		as for regular results. The default implementation returns None.
+		"""
+		return None
+
+
+	def combine_or_extend(self,
+		previous: None | Sequence[DataPointId] | T1CombineResult,
+		datapoints: Iterable[DataPoint],
+		history: Callable[[], Iterable[DataPoint]]
+	) -> Sequence[DataPointId] | T1CombineResult:
+		"""
+		:param previous: previous result if available
+		:param datapoints: datapoints added since the previous result was computed
+		:param history: callable returning the full datapoint history (including the new datapoints),
+		called only if the result cannot be computed incrementally (ex: loading datapoints from the DB)
+
+		In []: unit.combine_or_extend(t1_doc['dps'], new_dps, lambda: load_dps(stock))
+		"""
+		if previous is not None and (ret := self.combine_incremental(previous, datapoints)) is not None:
+			return ret
+		return self.combine(history())
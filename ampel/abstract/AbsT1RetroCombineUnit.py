@@ -7,16 +7,20 @@
 # Last Modified Date:  01.11.2025
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from ampel.types import ChannelId, DataPointId
-from ampel.base.decorator import abstractmethod
+from ampel.base.decorator import abstractmethod, defaultmethod
 from ampel.base.LogicalUnit import LogicalUnit
 from ampel.content.DataPoint import DataPoint
 from ampel.struct.T1CombineResult import T1CombineResult
 
 
 class AbsT1RetroCombineUnit(LogicalUnit, abstract=True):
-	""" A unit that combines datapoints """
+	"""
+	A unit that combines datapoints into several (historical) states.
+	See ampel.util.retro.iter_retro_states for a memory efficient way of generating states
+	corresponding to prefixes of the sorted datapoints of a stock.
+	"""
 
 	debug: bool = False
 	access: Sequence[int | str] = []
@@ -26,3 +30,12 @@ class AbsT1RetroCombineUnit(LogicalUnit, abstract=True):
 	@abstractmethod
 	def combine(self, datapoints: Iterable[DataPoint]) -> Sequence[Sequence[DataPointId]] | Sequence[T1CombineResult]:
 		...
+
+
+	@defaultmethod
+	def iter_combine(self, datapoints: Iterable[DataPoint]) -> Iterator[Sequence[DataPointId] | T1CombineResult]:
+		"""
+		Generator variant of combine, allowing the states of stocks with many retro states
+		to be processed one at a time. The default implementation yields the elements returned by combine.
+		"""
+		yield from self.combine(datapoints)
@@ -11,7 +11,7 @@ from collections.abc import Sequence
 from typing import Generic
 
 from ampel.abstract.AbsTiedT2Unit import AbsTiedT2Unit
-from ampel.base.decorator import abstractmethod
+from ampel.base.decorator import abstractmethod, defaultmethod
 from ampel.content.DataPoint import DataPoint
 from ampel.content.T1Document import T1Document
 from ampel.model.StateT2Dependency import StateT2Dependency, T
@@ -39,3 +39,23 @@ class AbsTiedStateT2Unit(AbsTiedT2Unit, Generic[T], abstract=True):
 
 		.. note:: the returned dict must have only string keys and be BSON-encodable
 		"""
+
+
+	@defaultmethod
+	def process_many(self,
+		states: Sequence[tuple[T1Document, Sequence[DataPoint], Sequence[T2DocView]]]
+	) -> list[UBson | UnitResult | Exception]:
+		"""
+		Processes several (compound, datapoints, t2_views) tuples at once.
+		See AbsStateT2Unit.process_many for the error isolation model:
+		exceptions related to a given state are returned at its position rather than raised.
+
+		:returns: one result (or exception) per state, in the order of the provided states
+		"""
+		ret: list[UBson | UnitResult | Exception] = []
+		for compound, datapoints, t2_views in states:
+			try:
+				ret.append(self.process(compound, datapoints, t2_views))
+			except Exception as e: # noqa: PERF203
+				ret.append(e)
+		return ret
@@ -21,6 +21,7 @@ class AmpelABC:
 	- Supports multi-level and multiple inheritance.
 	- Allows overriding abstract methods if the subclass is itself abstract.
 	- Relies on the `inspect` module.
+	- Abstract coroutine methods (async def) must be implemented by coroutine methods.
 	- Set `AmpelABC._abcheck = False` to disable all checks.
 	- If a subclass defines `__init_subclass__`, it must call
 	  `super().__init_subclass__(**kwargs)` within that method.
@@ -135,6 +136,12 @@ class AmpelABC:
 			else:
 				abstract_sig = inspect.signature(value[1])
 
+			if inspect.iscoroutinefunction(value[1]) and not inspect.iscoroutinefunction(impl):
+				raise TypeError(
+					f"Method '{method_name}' of class {Klass.__name__} must be a coroutine (async def) "
+					f"as defined by the corresponding abstract method in class {value[0].__name__}"
+				)
+
 			impl_sig_keys = list(inspect.signature(impl).parameters.keys())
 
 			# Manually at cls for bound methods
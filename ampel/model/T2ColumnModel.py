@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/model/T2ColumnModel.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from typing import Literal
+
+from ampel.base.AmpelBaseModel import AmpelBaseModel
+
+
+class T2ColumnModel(AmpelBaseModel):
+	"""
+	Projection of a T2 result value into a table column (see T2Table)
+
+	In []: T2ColumnModel(unit=("T2NedSNCosmo", "T2SNCosmo"), path="fit_result.z")
+	"""
+
+	#: T2 unit name(s). If several units are provided, the value of the first
+	#: matching T2 document (order of SnapView.t2) having a valid value is used
+	unit: str | tuple[str, ...]
+
+	#: Path to the value within the latest T2 body element (see get_by_path)
+	path: str | tuple[str | int, ...]
+
+	#: Expected value type. Values of other types are considered missing (null).
+	#: Integers are accepted by float columns, booleans are only accepted by bool and object columns.
+	dtype: Literal['float', 'int', 'bool', 'str', 'object'] = 'float'
+
+	#: Restrict to body elements associated with the given meta code (see T2DocView.get_payload)
+	code: None | int = None
@@ -7,6 +7,8 @@
 # Last Modified Date:  22.06.2021
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
+from collections.abc import Iterable
+from time import monotonic
 from typing import Any, overload
 
 from ampel.abstract.AbsSecretProvider import AbsSecretProvider
@@ -15,22 +17,145 @@ from ampel.secret.Secret import Secret, T
 
 
 class AmpelVault:
-	""" Collection of secret providers """
+	"""
+	Collection of secret providers.
 
-	def __init__(self, providers: list[AbsSecretProvider]) -> None:
+	Values of resolved named secrets are cached by label so that repeated resolutions
+	(ex: instantiation of units sharing secrets) do not query providers again.
+	A cached value is only used if it is an instance of the requested value type
+	(values prefetched without type are thus usable by typed secrets, ex: NamedSecret[str]).
+	Counters:
+	- hits / misses: cache lookups of named secrets
+	- provider_calls: number of tell / tell_many calls made to providers
+	- saved_calls: number of provider calls avoided thanks to the cache
+	"""
+
+	def __init__(self,
+		providers: list[AbsSecretProvider],
+		cache: bool = True,
+		ttl: None | float = None
+	) -> None:
+		"""
+		:param cache: whether values of resolved named secrets should be cached
+		:param ttl: optional time to live (in seconds) of cached values
+		"""
 		self.providers = providers
+		self.cache = cache
+		self.ttl = ttl
+
+		# label -> (value, expiry, number of provider calls required to resolve it)
+		self._cache: dict[str, tuple[Any, float, int]] = {}
+		self.hits = 0
+		self.misses = 0
+		self.provider_calls = 0
+		self.saved_calls = 0
+
 
 	def resolve_secret(self, secret: Secret, ValueType: type) -> bool:
-		return any(sp.tell(secret, ValueType) for sp in self.providers)
+
+		if not self.cache or not isinstance(secret, NamedSecret):
+			return self._tell(secret, ValueType)[0]
+
+		if (entry := self._get(secret.label, ValueType)) is not None:
+			self.hits += 1
+			self.saved_calls += entry[2]
+			secret.set(entry[0])
+			return True
+
+		self.misses += 1
+		ok, ncalls = self._tell(secret, ValueType)
+		if ok:
+			self._store(secret.label, secret.get(), ncalls)
+		return ok
+
+
+	def _get(self, label: str, ValueType: type) -> None | tuple[Any, float, int]:
+		""" :returns: the unexpired cache entry of the label if its value is an instance of ValueType """
+		if (entry := self._cache.get(label)) is None:
+			return None
+		if entry[1] <= monotonic():
+			del self._cache[label]
+			return None
+		return entry if isinstance(entry[0], ValueType) else None
+
+
+	def _tell(self, secret: Secret, ValueType: type) -> tuple[bool, int]:
+		""" :returns: resolution success and number of providers queried """
+		for i, sp in enumerate(self.providers, 1):
+			self.provider_calls += 1
+			if sp.tell(secret, ValueType):
+				return True, i
+		return False, len(self.providers)
+
+
+	def _store(self, label: str, value: Any, ncalls: int) -> None:
+		self._cache[label] = value, float('inf') if self.ttl is None else monotonic() + self.ttl, ncalls
+
+
+	def prefetch(self, labels: Iterable[str], ValueType: type = object) -> list[str]:
+		"""
+		Resolves and caches several named secrets at once (ex: at startup, see collect_labels),
+		querying each provider once via tell_many.
+		:returns: labels which could not be resolved
+		"""
+
+		if not self.cache:
+			raise ValueError("Prefetching requires caching to be enabled")
+
+		todo: dict[str, NamedSecret] = {}
+		with NamedSecret.resolve_with(None):
+			for label in labels:
+				if self._get(label, ValueType) is None:
+					todo[label] = NamedSecret[ValueType](label=label) # type: ignore[valid-type]
+
+		for ncalls, sp in enumerate(self.providers, 1):
+			if not todo:
+				break
+			self.provider_calls += 1
+			secrets = list(todo.values())
+			for ns, ok in zip(secrets, sp.tell_many(secrets, ValueType), strict=True):
+				if ok:
+					self._store(ns.label, ns.get(), ncalls)
+					del todo[ns.label]
+
+		return list(todo)
+
+
+	def clear_cache(self) -> None:
+		self._cache.clear()
+
+
+	@staticmethod
+	def collect_labels(conf: Any) -> set[str]:
+		"""
+		:returns: labels of the named secrets referenced in the provided (nested) config,
+		that is the values of dicts containing only the key 'label'
+
+		In []: AmpelVault.collect_labels({'unit': 'SlackPublisher', 'config': {'token': {'label': 'slack/token'}}})
+		Out[]: {'slack/token'}
+		"""
+		ret: set[str] = set()
+		stack = [conf]
+		while stack:
+			el = stack.pop()
+			if isinstance(el, dict):
+				if len(el) == 1 and isinstance(label := el.get('label'), str):
+					ret.add(label)
+				else:
+					stack.extend(el.values())
+			elif isinstance(el, list | tuple):
+				stack.extend(el)
+		return ret
+
 
 	@overload
 	def get_named_secret(self, label: str) -> None | NamedSecret[Any]:
 		...
-	
+
 	@overload
 	def get_named_secret(self, label: str, ValueType: type[T]) -> None | NamedSecret[T]:
 		...
-	
+
 	def get_named_secret(self, label, ValueType=object):
 		""" Returns a resolved NamedSecret using provided label """
 		with NamedSecret.resolve_with(None):
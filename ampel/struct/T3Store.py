@@ -7,7 +7,10 @@
 # Last Modified Date:  03.04.2023
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
+from collections import OrderedDict
 from collections.abc import Container, Iterable, Iterator, Sequence
+from heapq import merge
+from typing import ClassVar
 
 from ampel.config.AmpelConfig import AmpelConfig
 from ampel.content.T3Document import T3Document
@@ -20,10 +23,7 @@ from ampel.view.T3DocView import T3DocView
 
 class T3Store:
 
-	__slots__ = 'views', 'units', 'session', 'extra'
-
-	# Sequence of T3 views (see T3IncludeDirective.docs and T3Processor.include)
-	views: None | Sequence[T3DocView]
+	__slots__ = 'units', 'session', 'extra', '_views', '_tuple', '_index', '_confids'
 
 	# Set of unit names of the t3 views contained in this store
 	units: set[str]
@@ -36,6 +36,22 @@ class T3Store:
 	# Free-form dict (usable for dedicated inter-units communication for example)
 	extra: dict
 
+	# T3 views in insertion order
+	_views: list[T3DocView]
+
+	# Tuple version of _views returned by property 'views', rebuilt lazily after additions
+	_tuple: None | tuple[T3DocView, ...]
+
+	# (unit, confid, code) -> positions in _views
+	_index: dict[tuple[str, int, int], list[int]]
+
+	# Bounded LRU: id(config dict) -> (config dict, copy of config dict, hash).
+	# Config dicts are referenced to prevent id reuse, copies allow to detect modifications
+	_confids: OrderedDict[int, tuple[JDict, JDict, int]]
+
+	#: Max number of config hashes memoized by _get_confid
+	confid_cache_size: ClassVar[int] = 64
+
 
 	@classmethod # Static ctor
 	def of(cls, docs: None | Sequence[T3Document], conf: AmpelConfig) -> "T3Store":
@@ -48,10 +64,15 @@ class T3Store:
 
 
 	def __init__(self, views: None | Sequence[T3DocView] = None, session: None | JDict = None):
-		object.__setattr__(self, 'views', views)
 		object.__setattr__(self, 'session', ReadOnlyDict(session) if session else None)
-		object.__setattr__(self, 'units', set(v.unit for v in views) if views else set())
+		object.__setattr__(self, 'units', set())
 		object.__setattr__(self, 'extra', {})
+		object.__setattr__(self, '_views', [])
+		object.__setattr__(self, '_tuple', None)
+		object.__setattr__(self, '_index', {})
+		object.__setattr__(self, '_confids', OrderedDict())
+		for t3v in views or ():
+			self.add_view(t3v)
 
 
 	def __setattr__(self, k, v):
@@ -62,14 +83,27 @@ class T3Store:
 		raise ValueError("T3Store is read only")
 
 
+	def __reduce__(self):
+		# Rebuilt through the constructor (allows passing stores to process pools)
+		return _restore, (self._views, dict(self.session) if self.session else None, self.extra)
+
+
+	@property
+	def views(self) -> None | Sequence[T3DocView]:
+		""" Sequence of T3 views (see T3IncludeDirective.docs and T3Processor.include) """
+		if not self._views:
+			return None
+		if self._tuple is None:
+			object.__setattr__(self, '_tuple', tuple(self._views))
+		return self._tuple
+
+
 	def add_view(self, t3v: T3DocView) -> None:
 		self.units.add(t3v.unit)
-		if self.views:
-			l = list(self.views) if self.views else []
-			l.append(t3v)
-			object.__setattr__(self, 'views', tuple(l))
-		else:
-			object.__setattr__(self, 'views', (t3v, ))
+		self._index.setdefault((t3v.unit, t3v.confid, t3v.code), []).append(len(self._views))
+		self._views.append(t3v)
+		if self._tuple is not None:
+			object.__setattr__(self, '_tuple', None)
 
 
 	def add_session_info(self, d: JDict) -> None:
@@ -117,7 +151,7 @@ class T3Store:
 		:param unit: limits the returned science record(s) to the one with the provided t2 unit id
 		"""
 
-		if not self.views:
+		if not self._views:
 			return None
 
 		units: None | Container[str] = [unit] if isinstance(unit, str) else unit
@@ -125,22 +159,50 @@ class T3Store:
 		if config is None:
 			configs = None
 		elif isinstance(config, dict):
-			configs = [build_unsafe_dict_id(dictify(config))]
+			configs = [self._get_confid(config)]
 		elif isinstance(config, int):
 			configs = [config]
 		elif isinstance(config, Sequence):
 			configs = [
-				el if isinstance(el, int) else build_unsafe_dict_id(dictify(el))
+				el if isinstance(el, int) else self._get_confid(el)
 				for el in config
 			]
 		else:
 			configs = config
 
-		for t3v in self.views:
-			if units and t3v.unit not in units:
-				continue
-			if configs and t3v.confid not in configs:
-				continue
-			if code is not None and t3v.code != code:
-				continue
-			yield t3v
+		pos = [
+			v for k, v in self._index.items()
+			if (not units or k[0] in units) and
+			(not configs or k[1] in configs) and
+			(code is None or k[2] == code)
+		]
+
+		# views added while iterating are not returned
+		views = self._views
+		n = len(views)
+		for i in (pos[0] if len(pos) == 1 else merge(*pos)):
+			if i >= n:
+				break
+			yield views[i]
+
+
+	def _get_confid(self, config: JDict) -> int:
+		"""
+		Hashes of recently used config dicts are memoized along with a copy of their content,
+		which benefits callers reusing the same dict (ex: a module or instance level constant).
+		A memoized hash is only reused if the dict still equals the copy (i.e. was not modified since).
+		"""
+		if (x := self._confids.get(id(config))) and x[0] is config and x[1] == config:
+			self._confids.move_to_end(id(config))
+			return x[2]
+		h = build_unsafe_dict_id(d := dictify(config))
+		self._confids[id(config)] = (config, d, h)
+		if len(self._confids) > self.confid_cache_size:
+			self._confids.popitem(last=False)
+		return h
+
+
+def _restore(views: list[T3DocView], session: None | JDict, extra: dict) -> T3Store:
+	t3s = T3Store(views, session)
+	t3s.extra.update(extra)
+	return t3s
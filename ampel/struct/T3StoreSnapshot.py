@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/struct/T3StoreSnapshot.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from collections.abc import Container, Iterator
+from typing import Any
+
+from ampel.struct.T3Store import T3Store
+from ampel.view.T3DocView import T3DocView
+
+# Length of the pickled header (session and index of views)
+_hlen = struct.Struct('<Q')
+
+
+class T3StoreSnapshot:
+	"""
+	Read-only image of a T3Store (views and session) serialized into a memory-mapped file
+	(located in /dev/shm when available), allowing T3 units running in worker processes
+	to access the store content.
+
+	Instances are lightweight handles: only the path of the file and the number of
+	views are pickled when the snapshot is passed to workers, which attach to the image
+	rather than receiving pickled views.
+
+	In []: snap = T3StoreSnapshot.of(t3s)
+	In []: deltas = pool.map(run_unit, [snap] * 4)  # run_unit: t3s = snap.attach(); ...; return snap.delta(t3s)
+	In []: snap.merge(t3s, *deltas)
+	In []: snap.unlink()
+
+	File layout: header length, pickled header (session and an index of (unit, start, end) per view)
+	followed by the individually pickled views, so that workers only decode the views they need
+	(see iter_views). Views are pickled and thus restored unaltered.
+
+	Merge protocol: views added by workers to their attached store are returned by delta()
+	and added to the original store by merge(), in the order deltas are provided.
+	Modifications of 'extra' are not propagated.
+	"""
+
+	__slots__ = 'path', 'nviews'
+
+	#: Path of the file containing the serialized store
+	path: str
+
+	#: Number of views contained in the snapshot
+	nviews: int
+
+
+	@classmethod
+	def of(cls, store: T3Store, directory: None | str = None) -> "T3StoreSnapshot":
+		"""
+		:param directory: where to create the file backing the snapshot (default: /dev/shm if available)
+		"""
+
+		if directory is None and os.path.isdir('/dev/shm'):
+			directory = '/dev/shm'
+
+		views = store.views or ()
+		blobs = [pickle.dumps(v, pickle.HIGHEST_PROTOCOL) for v in views]
+		index = []
+		pos = 0
+		for v, b in zip(views, blobs, strict=True):
+			index.append((v.unit, pos, pos + len(b)))
+			pos += len(b)
+
+		header = pickle.dumps(
+			{'session': dict(store.session) if store.session else None, 'index': index},
+			pickle.HIGHEST_PROTOCOL
+		)
+
+		fd, path = tempfile.mkstemp(prefix='ampel_t3s_', dir=directory)
+		with os.fdopen(fd, 'wb') as f:
+			f.write(_hlen.pack(len(header)))
+			f.write(header)
+			f.writelines(blobs)
+
+		return cls(path, len(views))
+
+
+	def __init__(self, path: str, nviews: int) -> None:
+		self.path = path
+		self.nviews = nviews
+
+
+	def __getstate__(self) -> tuple[str, int]:
+		return self.path, self.nviews
+
+
+	def __setstate__(self, state: tuple[str, int]) -> None:
+		self.path, self.nviews = state
+
+
+	def __repr__(self) -> str:
+		return f'T3StoreSnapshot({self.path!r}, nviews={self.nviews})'
+
+
+	def attach(self) -> T3Store:
+		""" :returns: a new T3Store containing the views and session of the snapshot """
+		with open(self.path, 'rb') as f:
+			mm = self._map(f.fileno())
+			with mm:
+				header = self._header(mm)
+				return T3Store(
+					views = tuple(self._views(mm, header, None)) or None,
+					session = header['session']
+				)
+
+
+	def iter_views(self, units: None | Container[str] = None) -> Iterator[T3DocView]:
+		""" Decodes the views of the snapshot one at a time (optionally only those of the provided units) """
+		with open(self.path, 'rb') as f:
+			mm = self._map(f.fileno())
+			with mm:
+				yield from self._views(mm, self._header(mm), units)
+
+
+	def _map(self, fileno: int) -> mmap.mmap:
+		if os.fstat(fileno).st_size == 0:
+			raise ValueError(f"Empty snapshot file: {self.path}")
+		return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+
+	@staticmethod
+	def _header(mm: mmap.mmap) -> dict[str, Any]:
+		n = _hlen.unpack_from(mm)[0]
+		header = pickle.loads(mm[_hlen.size:_hlen.size + n])
+		header['offset'] = _hlen.size + n
+		return header
+
+
+	@staticmethod
+	def _views(mm: mmap.mmap, header: dict[str, Any], units: None | Container[str]) -> Iterator[T3DocView]:
+		offset = header['offset']
+		for unit, start, end in header['index']:
+			if units is None or unit in units:
+				yield pickle.loads(mm[offset + start:offset + end])
+
+
+	def delta(self, store: T3Store) -> bytes:
+		""" :returns: the views added to the provided (attached) store after the snapshot was taken """
+		return pickle.dumps((store.views or ())[self.nviews:], pickle.HIGHEST_PROTOCOL)
+
+
+	def merge(self, store: T3Store, *deltas: bytes) -> None:
+		""" Adds the views contained in the provided deltas to the store """
+		for delta in deltas:
+			for view in pickle.loads(delta):
+				store.add_view(view)
+
+
+	def unlink(self) -> None:
+		""" Removes the file backing the snapshot (workers must not attach afterwards) """
+		if os.path.exists(self.path):
+			os.unlink(self.path)
+
+
+	def __enter__(self) -> "T3StoreSnapshot":
+		return self
+
+
+	def __exit__(self, *args: Any) -> None:
+		self.unlink()
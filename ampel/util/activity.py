@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/util/activity.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from collections.abc import Iterable, Sequence
+from enum import IntFlag
+from typing import Any, Literal
+
+from ampel.content.JournalRecord import JournalRecord
+from ampel.content.MetaRecord import MetaRecord
+from ampel.content.StockDocument import StockDocument
+from ampel.enum.JournalActionCode import JournalActionCode
+from ampel.types import StockId
+
+try:
+	import numpy as np
+	HAVE_NUMPY = True
+except ImportError:
+	HAVE_NUMPY = False
+
+#: Value of missing integers (columns run and code)
+NA_INT = -(2**63)
+
+Reducer = Literal['count', 'sum', 'mean', 'median', 'min', 'max', 'nunique']
+
+
+class ActivityAggregator:
+	"""
+	Streaming aggregator turning journal records (or meta records) into numpy columns:
+	stock, ts, tier, run, code, action, duration, process.
+
+	Missing values are set to NA_INT (run, code), 0 (action), NaN (duration) or None (process).
+	The action column of meta records is the union of the actions of their activities (MetaActionCode).
+	Journal and meta records should not be mixed in the same aggregator as action codes differ.
+
+	Examples:
+
+	In []: agg = ActivityAggregator()
+	In []: agg.add_stocks(col.find({}))
+
+	How many stocks got T2_ADD_BODY per run:
+	In []: agg.group_by('run', 'stock', 'nunique', where=agg.has_action(JournalActionCode.T2_ADD_BODY))
+	Out[]: {1022: 125, 1023: 12}
+
+	Median duration per process:
+	In []: agg.group_by('process', 'duration', 'median')
+	Out[]: {'t2': 0.8, 't3': 12.1}
+	"""
+
+	fields = 'stock', 'ts', 'tier', 'run', 'code', 'action', 'duration', 'process'
+
+	def __init__(self, chunk_size: int = 65536) -> None:
+		"""
+		:param chunk_size: number of records buffered as python objects before being converted into arrays
+		"""
+		if not HAVE_NUMPY:
+			raise ValueError("numpy is not installed")
+		self.chunk_size = chunk_size
+		self._rows: list[tuple] = []
+		self._chunks: list[dict[str, Any]] = []
+		self._table: None | dict[str, Any] = None
+
+
+	def __len__(self) -> int:
+		return sum(len(c['ts']) for c in self._chunks) + len(self._rows)
+
+
+	def add_journal(self, stock: StockId, records: Iterable[JournalRecord]) -> None:
+		self._add(
+			(
+				stock, r['ts'], r['tier'], r.get('run', NA_INT), r.get('code', NA_INT),
+				r.get('action', 0), r.get('duration', np.nan), r.get('process')
+			)
+			for r in records
+		)
+
+
+	def add_meta(self, stock: StockId, records: Iterable[MetaRecord]) -> None:
+		self._add(
+			(
+				stock, r['ts'], r.get('tier', -1), r.get('run', NA_INT), r.get('code', NA_INT),
+				_union(r.get('activity')), r.get('duration', np.nan), r.get('process')
+			)
+			for r in records
+		)
+
+
+	def add_stocks(self, docs: Iterable[StockDocument]) -> None:
+		""" Adds the journal records of the provided stock documents """
+		for doc in docs:
+			self.add_journal(doc['stock'], doc['journal'])
+
+
+	def _add(self, rows: Iterable[tuple]) -> None:
+		self._table = None
+		for row in rows:
+			self._rows.append(row)
+			if len(self._rows) >= self.chunk_size:
+				self._flush()
+
+
+	def _flush(self) -> None:
+
+		if not self._rows:
+			return
+
+		cols = list(zip(*self._rows, strict=True))
+		n = len(self._rows)
+		self._chunks.append({
+			'stock': np.fromiter(
+				cols[0], count=n,
+				dtype=np.int64 if all(type(el) is int for el in cols[0]) else object
+			),
+			'ts': np.fromiter(cols[1], dtype=np.float64, count=n),
+			'tier': np.fromiter(cols[2], dtype=np.int8, count=n),
+			'run': np.fromiter(cols[3], dtype=np.int64, count=n),
+			'code': np.fromiter(cols[4], dtype=np.int64, count=n),
+			'action': np.fromiter(cols[5], dtype=np.int64, count=n),
+			'duration': np.fromiter(cols[6], dtype=np.float64, count=n),
+			'process': np.fromiter(cols[7], dtype=object, count=n)
+		})
+		self._rows = []
+
+
+	def table(self) -> dict[str, Any]:
+		""" :returns: dict of numpy arrays (one per field) """
+
+		if self._table is None:
+			self._flush()
+			if len(self._chunks) > 1:
+				self._chunks = [
+					{k: np.concatenate([c[k] for c in self._chunks]) for k in self.fields}
+				]
+			self._table = self._chunks[0] if self._chunks else {
+				k: np.empty(0, dtype=object if k in ('stock', 'process') else np.float64)
+				for k in self.fields
+			}
+
+		return self._table
+
+
+	def has_action(self, flag: int | IntFlag) -> Any:
+		"""
+		:returns: boolean array, True for records whose action includes (any of the bits of) the provided flag
+		"""
+		return (self.table()['action'] & int(flag)) != 0
+
+
+	def decode_actions(self, flags: type[IntFlag] = JournalActionCode) -> dict[str, Any]:
+		"""
+		:returns: flag name -> boolean array (see has_action) for every member of the provided flag enum
+		"""
+		action = self.table()['action']
+		return {f.name: (action & int(f)) != 0 for f in flags if f.name}
+
+
+	def group_by(self,
+		key: str | Sequence[str],
+		value: None | str = None,
+		reducer: Reducer = 'count',
+		where: Any = None
+	) -> dict[Any, Any]:
+		"""
+		:param key: field(s) to group by. Group keys are tuples if several fields are provided.
+		:param value: field to reduce (not required for reducer 'count').
+		Records with NaN values (ex: missing durations) are ignored.
+		:param where: optional boolean array selecting the records to consider
+		:returns: group key -> reduced value
+		"""
+
+		t = self.table()
+		keys = [key] if isinstance(key, str) else list(key)
+		sel = np.ones(len(t['ts']), dtype=bool) if where is None else np.asarray(where, dtype=bool)
+
+		vals: Any = None
+		if value is not None:
+			vals = t[value]
+			if vals.dtype.kind == 'f':
+				sel = sel & ~np.isnan(vals)
+			vals = vals[sel]
+		elif reducer != 'count':
+			raise ValueError(f"Reducer '{reducer}' requires a value field")
+
+		# Group index of each record
+		uniques, inverses = zip(*(_factorize(t[k][sel]) for k in keys), strict=True)
+		if len(keys) == 1:
+			groups: list[Any] = uniques[0]
+			inv = inverses[0]
+		else:
+			combined, inv = np.unique(np.stack(inverses), axis=1, return_inverse=True)
+			inv = inv.ravel()
+			groups = [tuple(u[i] for u, i in zip(uniques, col, strict=True)) for col in combined.T.tolist()]
+
+		if not (n := len(groups)):
+			return {}
+
+		out: Any
+
+		if reducer == 'count':
+			out = np.bincount(inv, minlength=n)
+		elif reducer in ('sum', 'mean'):
+			out = np.bincount(inv, weights=vals, minlength=n)
+			if reducer == 'mean':
+				out = out / np.bincount(inv, minlength=n)
+		elif reducer in ('min', 'max'):
+			order = np.lexsort((vals, inv))
+			bounds = np.flatnonzero(np.diff(inv[order], append=n)) if reducer == 'max' \
+				else np.flatnonzero(np.diff(inv[order], prepend=-1))
+			out = vals[order][bounds]
+		elif reducer == 'median':
+			order = np.lexsort((vals, inv))
+			sv = vals[order]
+			splits = np.flatnonzero(np.diff(inv[order])) + 1
+			out = [np.median(el) for el in np.split(sv, splits)]
+		elif reducer == 'nunique':
+			pairs = np.unique(np.stack([inv, _factorize(vals)[1]]), axis=1)
+			out = np.bincount(pairs[0], minlength=n)
+		else:
+			raise ValueError(f"Unknown reducer: {reducer}")
+
+		return dict(
+			zip(groups, out.tolist() if isinstance(out, np.ndarray) else [float(el) for el in out], strict=True)
+		)
+
+
+def _factorize(arr: Any) -> tuple[list[Any], Any]:
+	""" :returns: sorted unique values (insertion order if values are not comparable) and inverse indexes """
+	if arr.dtype != object:
+		uniques, inverse = np.unique(arr, return_inverse=True)
+		return uniques.tolist(), inverse.ravel()
+	d: dict[Any, int] = {}
+	inv = np.fromiter((d.setdefault(el, len(d)) for el in arr), dtype=np.int64, count=len(arr))
+	try:
+		u = sorted(d)
+	except TypeError:
+		return list(d), inv
+	remap = np.fromiter((d[el] for el in u), dtype=np.int64, count=len(u))
+	return u, np.argsort(remap)[inv]
+
+
+def _union(activities: None | Sequence[Any]) -> int:
+	ret = 0
+	for a in activities or ():
+		ret |= a.get('action', 0)
+	return ret
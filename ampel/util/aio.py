@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/util/aio.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from ampel.struct.JournalAttributes import JournalAttributes
+from ampel.struct.StockAttributes import StockAttributes
+from ampel.struct.T3Store import T3Store
+from ampel.struct.UnitResult import UnitResult
+from ampel.types import StockId, T3Send, UBson
+
+if TYPE_CHECKING:
+	from ampel.abstract.AbsAsyncT3Unit import AbsAsyncT3Unit
+	from ampel.abstract.AbsAsyncT4Unit import AbsAsyncT4Unit
+	from ampel.view.SnapView import SnapView
+
+T = TypeVar("T", bound="SnapView")
+X = TypeVar("X")
+Y = TypeVar("Y")
+
+
+class AsyncViewStream(Generic[T]):
+	"""
+	Async iterator of views provided to AbsAsyncT3Unit instances.
+	Updates sent by units (see send) are collected in the attribute 'updates'.
+	"""
+
+	__slots__ = '_it', '_ait', '_last', '_task', 'updates'
+
+	def __init__(self, views: Iterable[T] | AsyncIterable[T]) -> None:
+		self._it = None if isinstance(views, AsyncIterable) else iter(views)
+		self._ait = aiter(views) if isinstance(views, AsyncIterable) else None
+		self._last: None | T = None
+		self._task: None | asyncio.Task[Any] = None
+		self.updates: list[tuple[StockId, JournalAttributes | StockAttributes]] = []
+
+
+	def __aiter__(self) -> 'AsyncViewStream[T]':
+		return self
+
+
+	async def __anext__(self) -> T:
+		self._task = _current_task()
+		if self._ait is None:
+			try:
+				self._last = next(self._it) # type: ignore[arg-type]
+			except StopIteration:
+				raise StopAsyncIteration from None
+		else:
+			self._last = await anext(self._ait)
+		return self._last
+
+
+	def send(self, arg: T3Send) -> None:
+		"""
+		Applies a modification to the last view yielded unless a stock id is provided via a tuple.
+		Tasks processing views concurrently (ex: coroutines run by bounded_map) must provide the stock id,
+		since the last view yielded is then not necessarily the view processed by the task:
+
+		In []: views.send((view.id, StockAttributes(journal=JournalAttributes(...))))
+
+		:raises ValueError: if no stock id is provided and either no view was yielded yet
+		or the caller is not the task iterating over the views
+		"""
+		if isinstance(arg, tuple):
+			self.updates.append(arg)
+		elif self._last is None:
+			raise ValueError("No view was yielded yet, please provide a stock id")
+		elif self._task is not _current_task():
+			raise ValueError("Updates sent by concurrent tasks require a stock id, please provide a tuple")
+		else:
+			self.updates.append((self._last.id, arg))
+
+
+async def bounded_map(
+	func: Callable[[X], Awaitable[Y]],
+	items: Iterable[X] | AsyncIterable[X],
+	limit: int = 32
+) -> AsyncIterator[Y]:
+	"""
+	Runs func concurrently for the provided items with at most 'limit' pending calls,
+	and yields the results in the order of the items.
+
+	In []: async for res in bounded_map(self.publish, views, limit=64):
+	   ...:     ...
+	"""
+
+	pending: deque[asyncio.Future[Y]] = deque()
+	try:
+		async for item in _aiter(items):
+			if len(pending) >= limit:
+				yield await pending.popleft()
+			pending.append(asyncio.ensure_future(func(item)))
+		while pending:
+			yield await pending.popleft()
+	finally:
+		for fut in pending:
+			fut.cancel()
+
+
+async def run_t3(
+	unit: 'AbsAsyncT3Unit[T]',
+	views: Iterable[T] | AsyncIterable[T],
+	t3s: None | T3Store = None
+) -> tuple[UBson | UnitResult, list[tuple[StockId, JournalAttributes | StockAttributes]]]:
+	"""
+	Reference runner for AbsAsyncT3Unit instances.
+	:returns: the result of the unit and the journal/stock updates sent by the unit
+
+	In []: res, updates = asyncio.run(run_t3(unit, views))
+	"""
+	stream = AsyncViewStream(views)
+	res = await unit.process(stream, t3s or T3Store())
+	return res, stream.updates
+
+
+async def run_t4(unit: 'AbsAsyncT4Unit') -> UBson | UnitResult:
+	""" Reference runner for AbsAsyncT4Unit instances """
+	return await unit.do()
+
+
+def _current_task() -> None | asyncio.Task[Any]:
+	try:
+		return asyncio.current_task()
+	except RuntimeError: # no running event loop
+		return None
+
+
+async def _aiter(items: Iterable[Any] | AsyncIterable[Any]) -> AsyncIterator[Any]:
+	if isinstance(items, AsyncIterable):
+		async for item in items:
+			yield item
+	else:
+		for item in items:
+			yield item
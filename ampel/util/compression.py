@@ -7,7 +7,9 @@
 # Last Modified Date:  20.04.2022
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from typing import Literal
 
@@ -29,12 +31,31 @@ def compress(
 def compress_many(
 	arg: dict[str, bytes],
 	alg: TCompression = "ZIP_DEFLATED",
-	compression_level: int = 9
+	compression_level: int = 9,
+	max_workers: int = 1
 ) -> bytes:
+	"""
+	:param max_workers: number of threads used to compress archive members.
+	zlib, lzma and bz2 release the GIL while compressing, so values > 1 allow
+	members to be deflated concurrently. The archive is still assembled sequentially
+	(in the order of the input dict) and is identical to the one built with max_workers=1.
+	"""
 
 	outbio, zf = _new_zip_file(alg, compression_level)
-	for k, v in arg.items():
-		zf.writestr(k, v)
+
+	if max_workers > 1 and len(arg) > 1:
+		ctype = getattr(zipfile, alg)
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			blobs = executor.map(
+				lambda v: _deflate(v, ctype, compression_level),
+				arg.values()
+			)
+			for (k, v), blob in zip(arg.items(), blobs, strict=True):
+				_write_precompressed(zf, k, v, blob)
+	else:
+		for k, v in arg.items():
+			zf.writestr(k, v)
+
 	zf.close()
 
 	return outbio.getvalue()
@@ -52,6 +73,46 @@ def _new_zip_file(
 	)
 
 
+class _Precompressed:
+	"""
+	Stands in for the compressor of a zipfile write handle,
+	returning data already compressed by a worker thread
+	"""
+
+	__slots__ = 'blob',
+
+	def __init__(self, blob: bytes) -> None:
+		self.blob = blob
+
+	def compress(self, data: bytes) -> bytes:
+		return self.blob
+
+	def flush(self) -> bytes:
+		return b''
+
+
+def _deflate(payload: bytes, ctype: int, compression_level: int) -> bytes:
+	# Same compressor zipfile uses internally (LZMA streams require zipfile's header handling)
+	c = zipfile._get_compressor(ctype, compression_level) # type: ignore[attr-defined] # noqa: SLF001
+	return c.compress(payload) + c.flush()
+
+
+def _write_precompressed(zf: zipfile.ZipFile, name: str, payload: bytes, blob: bytes) -> None:
+	""" Mirrors ZipFile.writestr(name, payload) using pre-computed compressed data """
+
+	zinfo = zipfile.ZipInfo(filename=name, date_time=time.localtime(time.time())[:6])
+	zinfo.compress_type = zf.compression
+	if name[-1] == '/':
+		zinfo.external_attr = 0o40775 << 16 | 0x10
+	else:
+		zinfo.external_attr = 0o600 << 16
+	zinfo.file_size = len(payload)
+
+	with zf.open(zinfo, mode='w') as dest:
+		dest._compressor = _Precompressed(blob) # type: ignore[attr-defined] # noqa: SLF001
+		dest.write(payload) # crc and sizes are computed by zipfile
+
+
 def decompress(arg: bytes) -> bytes:
 	bio = BytesIO()
 	bio.write(arg)
@@ -64,8 +125,16 @@ def decompress_str(arg: bytes) -> str:
 	return str(decompress(arg), "utf8")
 
 
-def decompress_many(arg: bytes) -> dict[str, bytes]:
+def decompress_many(arg: bytes, max_workers: int = 1) -> dict[str, bytes]:
+	"""
+	:param max_workers: number of threads used to inflate archive members.
+	Reads from the underlying buffer are serialized by zipfile, decompression is not.
+	"""
 	bio = BytesIO()
 	bio.write(arg)
 	zf = zipfile.ZipFile(bio)
-	return {file_name: zf.read(file_name) for file_name in zf.namelist()}
+	names = zf.namelist()
+	if max_workers > 1 and len(names) > 1:
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			return dict(zip(names, executor.map(zf.read, names), strict=True))
+	return {file_name: zf.read(file_name) for file_name in names}
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/util/datapoints.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from collections.abc import Iterable, Mapping, Sequence
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Literal
+
+from ampel.content.DataPoint import DataPoint
+
+try:
+	import numpy as np
+	HAVE_NUMPY = True
+except ImportError:
+	HAVE_NUMPY = False
+
+if TYPE_CHECKING:
+	from ampel.view.SnapView import SnapView
+
+DPColumnsOutput = Literal['numpy', 'structured', 'list']
+
+
+def dp_columns(
+	dps: Iterable[DataPoint],
+	fields: Sequence[str],
+	sort: None | str = None,
+	output: DPColumnsOutput = 'numpy',
+	dtype: None | str | Mapping[str, str] = None,
+	readonly: bool = False
+) -> Any:
+	"""
+	Extracts the provided body fields of datapoints into columns.
+	Datapoints whose body lacks any of the requested fields (or the sort key),
+	or for which the associated value is None, are skipped.
+
+	In []: dp_columns(dps, ['jd', 'magpsf', 'fid'], sort='jd', dtype={'fid': 'int8'})
+	Out[]: {'jd': array([2459000.5, 2459001.7]), 'magpsf': array([18.2, 18.1]), 'fid': array([1, 2], dtype=int8)}
+
+	:param sort: body field used to (stably) sort datapoints
+	:param output:
+	- 'numpy': dict of numpy arrays
+	- 'structured': numpy structured array
+	- 'list': dict of tuples
+	:param dtype: numpy dtype of all columns or of specific columns (by field name).
+	Unspecified dtypes are inferred by numpy.
+	:param readonly: whether returned numpy arrays should be non-writeable
+	"""
+
+	keys = list(fields)
+	if sort and sort not in keys:
+		keys.append(sort)
+
+	rows = []
+	for dp in dps:
+		body = dp['body']
+		try:
+			row = tuple(body[k] for k in keys)
+		except KeyError:
+			continue
+		if any(v is None for v in row):
+			continue
+		rows.append(row)
+
+	if sort:
+		rows.sort(key=itemgetter(keys.index(sort)))
+
+	cols = list(zip(*rows, strict=True)) if rows else [() for _ in keys]
+
+	if output == 'list':
+		return dict(zip(fields, cols, strict=False))
+
+	return _to_numpy(dict(zip(fields, cols, strict=False)), output, dtype, readonly)
+
+
+def stack_t0_columns(
+	views: Iterable["SnapView"],
+	fields: Sequence[str],
+	sort: None | str = None,
+	output: Literal['numpy', 'structured'] = 'numpy',
+	dtype: None | str | Mapping[str, str] = None
+) -> tuple[Any, Any]:
+	"""
+	Stacks the datapoint columns (see SnapView.get_t0_columns) of many views into ragged arrays.
+
+	:returns: a tuple (columns, offsets) where columns contains the concatenated values of all views
+	(dict of numpy arrays or structured array, see dp_columns) and offsets is an integer array
+	of length len(views) + 1 such that the datapoints of the i-th view
+	are located in the range [offsets[i], offsets[i+1]).
+	"""
+
+	if not HAVE_NUMPY:
+		raise ValueError("numpy is not installed")
+
+	parts = [view.get_t0_columns(fields, sort, 'list') for view in views]
+	offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+	if parts:
+		np.cumsum([len(p[fields[0]]) if fields else 0 for p in parts], out=offsets[1:])
+
+	return _to_numpy(
+		{k: [v for p in parts for v in p[k]] for k in fields},
+		output, dtype, False
+	), offsets
+
+
+def _to_numpy(
+	cols: dict[str, Sequence[Any]],
+	output: DPColumnsOutput,
+	dtype: None | str | Mapping[str, str],
+	readonly: bool
+) -> Any:
+
+	if not HAVE_NUMPY:
+		raise ValueError("numpy is not installed")
+
+	arrs = {
+		k: np.array(v, dtype=dtype.get(k) if isinstance(dtype, Mapping) else dtype)
+		for k, v in cols.items()
+	}
+
+	if output == 'structured':
+		out = np.empty(
+			len(next(iter(arrs.values()))) if arrs else 0,
+			dtype=[(k, a.dtype) for k, a in arrs.items()]
+		)
+		for k, a in arrs.items():
+			out[k] = a
+		if readonly:
+			out.flags.writeable = False
+		return out
+
+	if readonly:
+		for a in arrs.values():
+			a.flags.writeable = False
+
+	return arrs
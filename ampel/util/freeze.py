@@ -7,12 +7,15 @@
 # Last Modified Date:  09.06.2020
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
+from collections import OrderedDict
+from collections.abc import Hashable
 from typing import Any
+from weakref import WeakValueDictionary
 
 from ampel.view.ReadOnlyDict import ReadOnlyDict
 
 
-def recursive_freeze(arg: Any) -> Any:
+def recursive_freeze(arg: Any, pool: "None | FreezePool" = None) -> Any:
 	"""
 	Return an immutable shallow copy
 	:param arg:
@@ -20,7 +23,11 @@ def recursive_freeze(arg: Any) -> Any:
 		list: tuple is returned
 		set: frozenset is returned
 		otherwise: arg is returned 'as is'
+	:param pool: if provided, dicts with an 'id' key (ex: datapoints) are frozen through the pool
 	"""
+	if pool is not None and isinstance(arg, dict) and 'id' in arg:
+		return pool.freeze(arg)
+
 	if isinstance(arg, dict):
 		return ReadOnlyDict(
 			{
@@ -61,3 +68,89 @@ def recursive_unfreeze(arg: ReadOnlyDict) -> dict:
 		return set(arg)
 
 	return arg
+
+
+class FreezePool:
+	"""
+	Interning pool of frozen documents keyed by their 'id' value.
+	Freezing a document whose id is known returns the frozen instance already available in the pool,
+	so that identical documents (ex: datapoints shared by several stocks/views) are frozen only once
+	and share the same object.
+
+	Frozen documents are referenced weakly, i.e. removed from the pool when no longer used elsewhere.
+	If maxsize is set, the maxsize most recently used documents are additionally kept alive (LRU).
+
+	In []: pool = FreezePool()
+	In []: pool.freeze({'id': 1, 'body': {'a': [1]}}) is pool.freeze({'id': 1, 'body': {'a': [1]}})
+	Out[]: True
+	"""
+
+	def __init__(self, maxsize: int = 0, verify: bool = True) -> None:
+		"""
+		:param maxsize: number of documents strongly referenced by the pool (0: none)
+		:param verify: whether to check that a document is equal to the pooled document with the same id
+		before returning the latter. Disable only if documents with a given id are known to be identical
+		(otherwise, a mismatching document is frozen and replaces the previous one).
+		"""
+		self.maxsize = maxsize
+		self.verify = verify
+		self.hits = 0
+		self.misses = 0
+		self._docs: WeakValueDictionary[Hashable, ReadOnlyDict] = WeakValueDictionary()
+		self._lru: OrderedDict[Hashable, ReadOnlyDict] = OrderedDict()
+
+
+	def __len__(self) -> int:
+		return len(self._docs)
+
+
+	def __contains__(self, doc_id: Hashable) -> bool:
+		return doc_id in self._docs
+
+
+	def freeze(self, doc: dict[str, Any]) -> ReadOnlyDict:
+		""" :returns: the frozen version of doc (see recursive_freeze) """
+
+		doc_id = doc['id']
+		if isinstance(doc_id, list):
+			doc_id = tuple(doc_id)
+
+		if (f := self._docs.get(doc_id)) is not None and (not self.verify or _frozen_eq(f, doc)):
+			self.hits += 1
+		else:
+			self.misses += 1
+			f = self._docs[doc_id] = recursive_freeze(doc)
+
+		if self.maxsize:
+			self._lru[doc_id] = f
+			self._lru.move_to_end(doc_id)
+			if len(self._lru) > self.maxsize:
+				self._lru.popitem(last=False)
+
+		return f
+
+
+	def clear(self) -> None:
+		self._docs.clear()
+		self._lru.clear()
+
+
+def _frozen_eq(frozen: Any, arg: Any) -> bool:
+	""" :returns: whether recursive_freeze(arg) == frozen, without freezing arg """
+
+	if isinstance(arg, dict):
+		return (
+			isinstance(frozen, dict) and len(frozen) == len(arg) and
+			all(k in frozen and _frozen_eq(frozen[k], v) for k, v in arg.items())
+		)
+
+	if isinstance(arg, list):
+		return (
+			isinstance(frozen, tuple) and len(frozen) == len(arg) and
+			all(_frozen_eq(a, b) for a, b in zip(frozen, arg, strict=True))
+		)
+
+	if isinstance(arg, set):
+		return isinstance(frozen, frozenset) and frozen == arg
+
+	return type(frozen) is type(arg) and frozen == arg
@@ -8,6 +8,8 @@
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
 import json
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from typing import TypeVar
 
 import xxhash
@@ -54,6 +56,43 @@ def hash_payload(payload: bytes, ret: type[HT] = int, size: int = -64) -> HT: #
 	return x
 
 
+def _signed(x: int, size: int) -> int:
+	return x - 2**-size if x & (1 << (-size-1)) else x
+
+
+def hash_ids(ids: Sequence[int], size: int = -64) -> int:
+	"""
+	:param ids: 64 bits integers (ex: datapoint ids)
+	:param size: see hash_payload docstring
+	:returns: integer hash of the provided ids (order matters)
+	"""
+	return hash_payload(array('q', ids).tobytes(), size=size)
+
+
+def iter_prefix_hashes(ids: Sequence[int], ends: None | Iterable[int] = None, size: int = -64) -> Iterator[int]:
+	"""
+	Computes in one pass the hashes of several prefixes of the provided ids,
+	each hash being equal to hash_ids(ids[:end]).
+
+	:param ends: increasing prefix lengths (default: 1, 2, ..., len(ids))
+	:param size: see hash_payload docstring
+
+	In []: list(iter_prefix_hashes([10, 20, 30], ends=[1, 3])) == [hash_ids([10]), hash_ids([10, 20, 30])]
+	Out[]: True
+	"""
+
+	buf = memoryview(array('q', ids).tobytes())
+	h = getattr(xxhash, f'xxh{abs(size)}')()
+	prev = 0
+
+	for end in range(1, len(ids) + 1) if ends is None else ends:
+		if end < prev or end > len(ids):
+			raise ValueError(f"Invalid prefix length: {end}")
+		h.update(buf[prev * 8: end * 8])
+		prev = end
+		yield _signed(h.intdigest(), size) if size < 0 else h.intdigest()
+
+
 def build_unsafe_dict_id(
 	dict_arg: None | dict,
 	ret: type[HT] = int, # type: ignore[assignment]
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/util/idmapping.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any, ClassVar, TypeVar
+
+from ampel.types import StockId
+
+try:
+	import numpy as np
+	HAVE_NUMPY = True
+except ImportError:
+	HAVE_NUMPY = False
+
+X = TypeVar("X")
+Y = TypeVar("Y")
+
+
+def map_distinct(func: Callable[[list[X]], list[Y]], values: Sequence[X]) -> list[Y]:
+	"""
+	Calls func once with the distinct provided values and maps the results back to all values.
+	Integer values are deduplicated with numpy if available (faster than a dict in this case).
+	Deduplication has a cost: it only pays off for costly conversions of values with many duplicates.
+
+	In []: map_distinct(lambda v: [x * 2 for x in v], [1, 2, 1])
+	Out[]: [2, 4, 2]
+	"""
+
+	if not values:
+		return []
+
+	if HAVE_NUMPY and all(type(v) is int for v in values):
+		try:
+			uniques, inverse = np.unique(np.asarray(values, dtype=np.int64), return_inverse=True)
+		except OverflowError:
+			pass
+		else:
+			mapped = func(uniques.tolist())
+			return [mapped[i] for i in inverse.ravel().tolist()]
+
+	d: dict[X, int] = {}
+	inv = [d.setdefault(v, len(d)) for v in values]
+	mapped = func(list(d))
+
+	# Distinct values are in input order
+	return mapped if len(d) == len(values) else [mapped[i] for i in inv]
+
+
+class BidirectionalLRU:
+	""" Bounded LRU cache of ampel id <-> external id associations """
+
+	__slots__ = 'maxsize', '_ampel', '_ext', 'hits', 'misses'
+
+	def __init__(self, maxsize: int = 65536) -> None:
+		self.maxsize = maxsize
+		self._ampel: OrderedDict[StockId, str] = OrderedDict()
+		self._ext: OrderedDict[str, StockId] = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+
+	def __len__(self) -> int:
+		return len(self._ampel)
+
+
+	def get_ext_id(self, ampel_id: StockId) -> None | str:
+		return self._get(self._ampel, self._ext, ampel_id)
+
+
+	def get_ampel_id(self, ext_id: str) -> None | StockId:
+		return self._get(self._ext, self._ampel, ext_id)
+
+
+	def _get(self, d: OrderedDict[Any, Any], reverse: OrderedDict[Any, Any], k: Any) -> Any:
+		if (v := d.get(k)) is None:
+			self.misses += 1
+			return None
+		self.hits += 1
+		# Both directions share the same recency order
+		d.move_to_end(k)
+		reverse.move_to_end(v)
+		return v
+
+
+	def put(self, ampel_id: StockId, ext_id: str) -> None:
+
+		if (old_ext := self._ampel.pop(ampel_id, None)) is not None:
+			self._ext.pop(old_ext, None)
+		if (old_ampel := self._ext.pop(ext_id, None)) is not None:
+			self._ampel.pop(old_ampel, None)
+
+		self._ampel[ampel_id] = ext_id
+		self._ext[ext_id] = ampel_id
+
+		while len(self._ampel) > self.maxsize:
+			self._ext.pop(self._ampel.popitem(last=False)[1], None)
+
+
+	def clear(self) -> None:
+		self._ampel.clear()
+		self._ext.clear()
+		self.hits = self.misses = 0
+
+
+class IdMapperCache:
+	"""
+	Mixin for AbsIdMapper subclasses adding a bounded bidirectional LRU cache
+	to the batch conversion methods to_ampel_ids and to_ext_ids:
+
+	In []: class ZTFIdMapper(IdMapperCache, AbsIdMapper):
+	   ...:     id_cache_size: ClassVar[int] = 100_000
+
+	Each class has its own cache (see get_id_cache).
+	Caching only pays off for mappers performing costly conversions (ex: database or service lookups)
+	of recurring ids. For mappers computing ids arithmetically (ex: base conversions),
+	cache bookkeeping is slower than the conversion itself (see benchmarks/bench_idmapper.py).
+	"""
+
+	#: Max number of associations kept in cache
+	id_cache_size: ClassVar[int] = 65536
+
+	# Provided by AbsIdMapper subclasses
+	to_ampel_id: ClassVar[Callable[..., Any]]
+	to_ext_id: ClassVar[Callable[..., Any]]
+
+
+	@classmethod
+	def get_id_cache(cls) -> BidirectionalLRU:
+		if (cache := cls.__dict__.get('_id_cache')) is None:
+			cache = BidirectionalLRU(cls.id_cache_size)
+			cls._id_cache = cache # type: ignore[attr-defined]
+		return cache
+
+
+	@classmethod
+	def to_ampel_ids(cls, ext_ids: Sequence[str]) -> list[int]:
+		cache = cls.get_id_cache()
+		return cls._cached(ext_ids, cache.get_ampel_id, cls.to_ampel_id, lambda e, a: cache.put(a, e))
+
+
+	@classmethod
+	def to_ext_ids(cls, ampel_ids: Sequence[StockId]) -> list[str]:
+		cache = cls.get_id_cache()
+		return cls._cached(ampel_ids, cache.get_ext_id, cls.to_ext_id, cache.put)
+
+
+	@staticmethod
+	def _cached(
+		values: Sequence[Any],
+		get: Callable[[Any], Any],
+		convert: Callable[[list[Any]], list[Any]],
+		put: Callable[[Any, Any], None]
+	) -> list[Any]:
+
+		ret = [get(v) for v in values]
+		if misses := [v for v, r in zip(values, ret, strict=True) if r is None]:
+			distinct = list(dict.fromkeys(misses))
+			converted = dict(zip(distinct, convert(distinct), strict=True))
+			for k, v in converted.items():
+				put(k, v)
+			ret = [converted[v] if r is None else r for v, r in zip(values, ret, strict=True)]
+		return ret
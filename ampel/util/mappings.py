@@ -7,8 +7,9 @@
 # Last Modified Date:  30.12.2021
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
-from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
 from contextlib import suppress
+from functools import lru_cache
 from typing import Any, overload
 
 from ampel.base.AmpelBaseModel import AmpelBaseModel
@@ -22,25 +23,142 @@ def try_int(key: str | int) -> str | int:
 		return key
 
 
+class CompiledPath:
+	"""
+	Path parsed once (see compile_path) and usable as accessor:
+
+	In []: cp = compile_path('body[-1].data[0]', json=True)
+	In []: cp.keys
+	Out[]: ('body', -1, 'data', 0)
+	In []: cp.get({'id': 1, 'body': [{'data': [{'a': 1}]}]})
+	Out[]: ('data', {'a': 1})
+	"""
+
+	__slots__ = 'keys', 'json', 'name'
+
+	#: keys and indices to walk through, None if the path is invalid (always resolves to None)
+	keys: None | tuple[str | int, ...]
+
+	#: whether get_by_json_path semantics apply
+	json: bool
+
+	#: name returned along with the value in json mode (last path element or '*')
+	name: None | str
+
+
+	def __init__(self, keys: None | tuple[str | int, ...], json: bool = False, name: None | str = None) -> None:
+		object.__setattr__(self, 'keys', keys)
+		object.__setattr__(self, 'json', json)
+		object.__setattr__(self, 'name', name)
+
+
+	def __setattr__(self, k, v):
+		raise ValueError("CompiledPath is read only")
+
+
+	def __repr__(self) -> str:
+		return f'CompiledPath({self.keys!r}{", json=True" if self.json else ""})'
+
+
+	def get(self, d: Any) -> Any:
+		"""
+		:returns: see get_by_path or get_by_json_path (json mode)
+		"""
+
+		if self.keys is None:
+			return None
+
+		if self.json:
+			try:
+				for k in self.keys:
+					if isinstance(k, str) and k not in d:
+						return None
+					d = d[k]
+			except Exception:
+				return None
+			return self.name, d
+
+		try:
+			for k in self.keys:
+				d = d[k]
+		except (TypeError, IndexError, KeyError):
+			return None
+
+		return d
+
+
+def compile_path(
+	path: str | int | Sequence[str | int], delimiter: str = '.', json: bool = False
+) -> CompiledPath:
+	"""
+	Parses a path once for repeated use with get_by_path, get_by_json_path or get_many.
+	Compiled paths are kept in a LRU cache, which get_by_path and get_by_json_path use as well.
+
+	:param json: whether to use the syntax and semantics of get_by_json_path (bracket notation support)
+	rather than those of get_by_path (dot notation, numeric keys converted to int)
+
+	In []: compile_path('foo.1_000.bar').keys
+	Out[]: ('foo', 1000, 'bar')
+	"""
+	return _compile_path(path if isinstance(path, str | int) else tuple(path), delimiter, json)
+
+
+@lru_cache(maxsize=2048)
+def _compile_path(path: str | int | tuple[str | int, ...], delimiter: str, json: bool) -> CompiledPath:
+
+	if not json:
+		if isinstance(path, str):
+			return CompiledPath(tuple(try_int(el) for el in path.split(delimiter)))
+		if isinstance(path, int):
+			return CompiledPath((path, ))
+		return CompiledPath(path)
+
+	els: Sequence[Any] = path.split(delimiter) if isinstance(path, str) else path # type: ignore[assignment]
+	if not els:
+		raise ValueError("Empty path")
+
+	# get_by_json_path returns as soon as a wildcard is encountered
+	# if the path ends with a wildcard
+	wildcard = els[-1] == '*'
+	if wildcard:
+		els = els[:els.index('*')]
+
+	keys: list[str | int] = []
+	name: None | str = None
+	try:
+		for el in els:
+			if el[-1] == ']':
+				splits = el.split("[")
+				keys.append(splits[0])
+				keys.append(int(splits[1][:-1]))
+				name = splits[0]
+			else:
+				keys.append(el)
+				name = el
+	except Exception:
+		return CompiledPath(None, True)
+
+	return CompiledPath(tuple(keys), True, '*' if wildcard else name)
+
+
 def get_by_path(
-	mapping: Mapping, path: str | int | Sequence[str | int], delimiter: str = '.'
+	mapping: Mapping, path: str | int | Sequence[str | int] | CompiledPath, delimiter: str = '.'
 ) -> None | UBson:
 	"""
 	Get an item from a nested mapping by path, e.g.
 	'foo.bar.baz' -> mapping['foo']['bar']['baz']
 
-	:param path: example: 'foo.bar.baz' or ['foo', 'bar', 'baz']
+	:param path: example: 'foo.bar.baz' or ['foo', 'bar', 'baz'] or a compiled path (see compile_path)
 	:param delimiter: example: '.'
 	"""
 
-	if isinstance(path, str):
-		parsed_path: Sequence[int | str] = [try_int(el) for el in path.split(delimiter)]
-	elif isinstance(path, int):
-		parsed_path = [path]
-	else:
-		parsed_path = path
+	if isinstance(path, CompiledPath):
+		return path.get(mapping)
+
+	if isinstance(path, str | int):
+		return _compile_path(path, delimiter, False).get(mapping)
 
-	for el in parsed_path:
+	for el in path:
 		try:
 			mapping = mapping[el]
 		except (TypeError, IndexError, KeyError): # noqa: PERF203
@@ -49,7 +167,9 @@ def get_by_path(
 	return mapping
 
 
-def get_by_json_path(d: Mapping, path: str | Sequence[str], delimiter: str = '.') -> None | tuple[str, UBson]:
+def get_by_json_path(
+	d: Mapping, path: str | Sequence[str] | CompiledPath, delimiter: str = '.'
+) -> None | tuple[str, UBson]:
 	"""
 	Lacks robustness, unflexible, fast.
 	Supports only Bracket notation with number (https://cburgmer.github.io/json-path-comparison/)
@@ -69,28 +189,29 @@ def get_by_json_path(d: Mapping, path: str | Sequence[str], delimiter: str = '.'
 	Out[]: 11.2 µs ± 222 ns per loop (mean ± std. dev. of 7 runs, 100000 loops each)
 	In []: %timeit parse('$.body[-1].data[0]').find(d)[0].value
 	Out[]: 5.87 ms ± 66.8 µs per loop (mean ± std. dev. of 7 runs, 100 loops each)
+
+	Parsed paths are cached (see compile_path).
 	"""
 
-	if isinstance(path, str):
-		path = path.split(delimiter)
+	if isinstance(path, CompiledPath):
+		return path.get(d)
 
-	try:
-		for el in path:
-			if el[-1] == ']':
-				splits = el.split("[")
-				el = splits[0] # noqa: PLW2901
-				idx = int(splits[1][:-1])
-				d = d[el][idx]
-				continue
-			if el == "*" and path[-1] == "*":
-				return "*", d
-			if el not in d:
-				return None
-			d = d[el]
-	except Exception:
-		return None
+	return _compile_path(
+		path if isinstance(path, str) else tuple(path), delimiter, True
+	).get(d)
 
-	return el, d
+
+def get_many(
+	docs: Iterable[Mapping], path: str | int | Sequence[str | int] | CompiledPath, delimiter: str = '.'
+) -> list[Any]:
+	"""
+	Batch variant of get_by_path (or get_by_json_path if a compiled json path is provided)
+
+	In []: get_many([{'a': {'b': 1}}, {'a': {}}], 'a.b')
+	Out[]: [1, None]
+	"""
+	cp = path if isinstance(path, CompiledPath) else compile_path(path, delimiter)
+	return list(map(cp.get, docs))
 
 
 def set_by_path(
@@ -173,64 +294,117 @@ def flatten_dict(
 	In []: flatten_dict({'d': {'e':1}, 'a': [{'c':2}, {'b':{'f':[3, 1, 2]}}]}, sort_keys=True, flatten_list_members=True, sort_lists=True, flatten_lists=True)
 	Out[]: {'a.0.b.f.0': 1, 'a.0.b.f.1': 2, 'a.0.b.f.2': 3, 'a.1.c': 2, 'd.e': 1}
 	"""
+	return dict(
+		iter_flatten_dict(
+			d, separator, sort_keys, flatten_list_members, flatten_lists, sort_lists
+		)
+	)
 
-	try:
-		out = {}
-		for k in sorted(d.keys()) if sort_keys else d:
-
-			v = d[k]
-
-			if isinstance(v, dict):
-				for kk, vv in flatten_dict(
-					v, separator, sort_keys, flatten_list_members, flatten_lists, sort_lists
-				).items():
-					out[f'{k}{separator}{kk}'] = vv
-
-			elif isinstance(v, strict_iterable):
 
-				if flatten_list_members:
-					v = [
-						flatten_dict(el, separator, sort_keys, flatten_list_members, flatten_lists, sort_lists)
-						if isinstance(el, dict) else el
-						for el in v
-					]
+def iter_flatten_dict(
+	d: Mapping,
+	separator: str = '.',
+	sort_keys: bool = False,
+	flatten_list_members: bool = False,
+	flatten_lists: bool = False,
+	sort_lists: bool = False,
+	key_paths: bool = False
+) -> Iterator[tuple[Any, Any]]:
+	"""
+	Lazy variant of flatten_dict yielding flattened (key, value) pairs in the order of flatten_dict's output.
+	Note that pairs with identical keys (ex: {'a.b': 1, 'a': {'b': 2}}) are all yielded.
 
-				if sort_lists:
+	The structure is walked iteratively using key-path tuples. The joined key prefix
+	of each nested dict/list is built once, when it is entered, rather than per level and per key.
+	The keys of every dict are sorted once (sort_keys=True), when the dict is entered.
 
-					# allow int/str mixed up
-					with suppress(Exception):
-						v = sorted(v, key=lambda x: str(x))
+	:param key_paths: yield key-path tuples rather than joined strings, ex: ('a', 0, 'b') instead of 'a.0.b'
+	(flattened list members excepted since those are flattened as standalone dicts, see flatten_list_members)
+	See flatten_dict for the other parameters.
 
-					# In []: sorted([{'c': 2}, {'b.f.0': 1, 'b.f.1': 2, 'b.f.2': 3}], key=lambda x: next(iter(x.keys())))
-					# Out[]: [{'b.f.0': 1, 'b.f.1': 2, 'b.f.2': 3}, {'c': 2}]
-					if flatten_list_members and all(isinstance(el, dict) for el in v):
-						v = sorted(v, key=lambda x: next(iter(x.keys())))
+	In []: list(iter_flatten_dict({'a': {'b': [1, 2]}}, flatten_lists=True, key_paths=True))
+	Out[]: [(('a', 'b', 0), 1), (('a', 'b', 1), 2)]
+	"""
 
-				if flatten_lists:
-					for kk, vv in flatten_dict(
-						{i: v[i] for i in range(len(v))},
-						separator, sort_keys, flatten_list_members, flatten_lists, sort_lists
-					).items():
-						out[f'{k}{separator}{kk}'] = vv
+	try:
 
+		# Frames: key-path, joined key prefix (ex: 'a.b.'), items iterator
+		stack: list[tuple[tuple[Any, ...], str, Iterator[tuple[Any, Any]]]] = [
+			((), '', iter(sorted(d.items(), key=_first) if sort_keys else d.items()))
+		]
+
+		while stack:
+
+			path, prefix, it = stack[-1]
+
+			for k, v in it:
+
+				if isinstance(v, dict):
+					stack.append(
+						(
+							(*path, k), f'{prefix}{k}{separator}',
+							iter(sorted(v.items(), key=_first) if sort_keys else v.items())
+						)
+					)
+					break
+
+				if isinstance(v, strict_iterable):
+
+					if flatten_list_members:
+						v = [ # noqa: PLW2901
+							flatten_dict(el, separator, sort_keys, flatten_list_members, flatten_lists, sort_lists)
+							if isinstance(el, dict) else el
+							for el in v
+						]
+
+					if sort_lists:
+
+						# allow int/str mixed up
+						with suppress(Exception):
+							v = sorted(v, key=str) # noqa: PLW2901
+
+						# In []: sorted([{'c': 2}, {'b.f.0': 1, 'b.f.1': 2, 'b.f.2': 3}], key=lambda x: next(iter(x.keys())))
+						# Out[]: [{'b.f.0': 1, 'b.f.1': 2, 'b.f.2': 3}, {'c': 2}]
+						if flatten_list_members and all(isinstance(el, dict) for el in v):
+							v = sorted(v, key=lambda x: next(iter(x.keys()))) # noqa: PLW2901
+
+					if flatten_lists:
+						# Raises TypeError for non-indexable iterables (sets)
+						stack.append(
+							(
+								(*path, k), f'{prefix}{k}{separator}',
+								enumerate(v if isinstance(v, list | tuple) else [v[i] for i in range(len(v))])
+							)
+						)
+						break
+
+				if key_paths:
+					yield (*path, k), v
+				elif path:
+					yield f'{prefix}{k}', v
 				else:
-					out[k] = v
-			else:
-				out[k] = v
+					yield k, v
 
-		return out
+			else:
+				stack.pop()
 
 	except Exception as e:
 		raise ValueError(f"Offending input: {d}") from e
 
 
+def _first(item: tuple[Any, Any]) -> Any:
+	return item[0]
+
+
 def unflatten_dict(
-	d: Mapping[str, Any],
+	d: Mapping[Any, Any],
 	separator: str = '.',
 	unflatten_list: bool = False,
 	sort: bool = False
 ) -> MutableMapping[str, Any]:
 	"""
+	:param d: flat dict whose keys are either strings joined using the provided separator or key-path tuples
+
 	Example:
 
 	In []: unflatten_dict({'count.chans.HU_SN': 10})
@@ -238,12 +412,15 @@ def unflatten_dict(
 
 	In []: unflatten_dict({'a.0.b.f.0': 1, 'a.0.b.f.1': 2, 'a.0.b.f.2': 3, 'a.1.c': 2, 'd.e': 1}, unflatten_list=True)
 	Out[]: {'a': [{'b': {'f': [1, 2, 3]}}, {'c': 2}], 'd': {'e': 1}}
+
+	In []: unflatten_dict({('count', 'chans', 'HU_SN'): 10})
+	Out[]: {'count': {'chans': {'HU_SN': 10}}}
 	"""
 	out: dict[str, Any] = {}
 
 	for key in sorted(d.keys()) if sort else d:
 
-		parts = key.split(separator)
+		parts = key if isinstance(key, tuple) else key.split(separator)
 		target: dict[str, Any] = out
 
 		for part in parts[:-1]:
@@ -267,18 +444,22 @@ def _unflatten_lists(d: dict) -> dict:
 	Out[]: {'a': [{'b': {'f': [1, 2, 3]}}, {'c': 2}], 'd': {'e': 1}}
 	"""
 
-	for k, v in d.items():
-		try:
-			# Following line's purpose is just to trigger an error when needed:
-			# it only works if v is a dict whose keys are integer (all of them)
-			[int(kk) for kk in v]
-			d[k] = [
-				_unflatten_lists(d[k][kk]) if isinstance(d[k][kk], dict) else d[k][kk]
-				for kk in v
-			]
-		except Exception: # noqa: PERF203
-			if isinstance(v, dict):
-				d[k] = _unflatten_lists(v)
+	stack = [d]
+
+	while stack:
+		cur = stack.pop()
+		for k, v in cur.items():
+			try:
+				# Following line's purpose is just to trigger an error when needed:
+				# it only works if v is a dict whose keys are integer (all of them)
+				[int(kk) for kk in v]
+				l = [v[kk] for kk in v]
+			except Exception:
+				if isinstance(v, dict):
+					stack.append(v)
+				continue
+			stack.extend(el for el in l if isinstance(el, dict))
+			cur[k] = l
 
 	return d
 
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/util/retro.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, overload
+
+from ampel.types import DataPointId
+from ampel.util.hash import iter_prefix_hashes
+
+
+class PrefixView(Sequence[DataPointId]):
+	"""
+	Read-only view of the first n elements of a datapoint id sequence.
+	Views of the retro states of a stock share the same underlying sequence (no copy is made).
+	Use list(view) to obtain a BSON-encodable list.
+	"""
+
+	__slots__ = '_ids', '_n'
+
+	def __init__(self, ids: Sequence[DataPointId], n: int) -> None:
+		self._ids = ids
+		self._n = n
+
+
+	@overload
+	def __getitem__(self, i: int) -> DataPointId:
+		...
+
+	@overload
+	def __getitem__(self, i: slice) -> list[DataPointId]:
+		...
+
+	def __getitem__(self, i: int | slice) -> DataPointId | list[DataPointId]:
+		if isinstance(i, slice):
+			return [self._ids[j] for j in range(*i.indices(self._n))]
+		if i < 0:
+			i += self._n
+		if not 0 <= i < self._n:
+			raise IndexError("PrefixView index out of range")
+		return self._ids[i]
+
+
+	def __len__(self) -> int:
+		return self._n
+
+
+	def __iter__(self) -> Iterator[DataPointId]:
+		ids = self._ids
+		return (ids[i] for i in range(self._n))
+
+
+	def __eq__(self, other: Any) -> bool:
+		if not isinstance(other, Sequence) or isinstance(other, str | bytes):
+			return NotImplemented
+		return len(other) == self._n and all(a == b for a, b in zip(self, other, strict=False))
+
+	__hash__ = None # type: ignore[assignment]
+
+
+	def __repr__(self) -> str:
+		return f'PrefixView({list(self)!r})'
+
+
+def iter_retro_states(
+	ids: Sequence[DataPointId],
+	ends: None | Iterable[int] = None,
+	size: int = -64
+) -> Iterator[tuple[PrefixView, int]]:
+	"""
+	Generates the retro states of a stock, that is the states associated with prefixes
+	of its (sorted) datapoint ids, together with their link (see hash_ids).
+	Links are computed in a single incremental hashing pass.
+
+	:param ids: datapoint ids, sorted according to the retro combine criteria (ex: by jd)
+	:param ends: increasing state lengths (default: 1, 2, ..., len(ids))
+	:param size: hash size, see hash_payload docstring
+
+	In []: for dps, link in iter_retro_states([10, 20, 30], ends=[2, 3]):
+	   ...:     print(list(dps), link == hash_ids(dps))
+	[10, 20] True
+	[10, 20, 30] True
+	"""
+
+	if ends is None:
+		ends = range(1, len(ids) + 1)
+	elif not isinstance(ends, Sequence):
+		ends = list(ends)
+
+	for end, link in zip(ends, iter_prefix_hashes(ids, ends, size), strict=True):
+		yield PrefixView(ids, end), link
@@ -7,9 +7,12 @@
 # Last Modified Date:  25.11.2021
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
-from collections.abc import Sequence
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from itertools import pairwise
 from typing import Literal, overload
 
+from ampel.content.DataPoint import DataPoint
 from ampel.types import Tag
 
 
@@ -131,3 +134,69 @@ def merge_tags(
 		)
 
 	return l[0] if reduce and len(l) == 1 else l
+
+
+class DataPointTagIndex:
+	"""
+	Index tag -> positions of the datapoints carrying it, built once for a batch of datapoint lists
+	(ex: the datapoints of each stock of an ingestion batch) and usable by several tag based filters:
+
+	In []: idx = DataPointTagIndex([dps_stock1, dps_stock2])
+	In []: idx.select(require=['ZTF_DP'], forbid=['ZTF_UL'])
+	Out[]: [[{'id': 1, 'tag': ['ZTF', 'ZTF_DP'], ...}], []]
+	"""
+
+	__slots__ = 'dps', 'offsets', 'index'
+
+	def __init__(self, dps_lists: Iterable[Sequence[DataPoint]]) -> None:
+
+		#: Datapoints of all lists
+		self.dps: list[DataPoint] = []
+
+		#: Datapoints of the i-th list are located in the range [offsets[i], offsets[i+1]) of dps
+		self.offsets: list[int] = [0]
+
+		#: tag -> positions in dps
+		self.index: dict[Tag, set[int]] = {}
+
+		i = 0
+		for dps in dps_lists:
+			for dp in dps:
+				tags = dp.get('tag', ())
+				for t in (tags, ) if isinstance(tags, str | int) else tags:
+					if (s := self.index.get(t)) is None:
+						self.index[t] = {i}
+					else:
+						s.add(i)
+				i += 1
+			self.dps.extend(dps)
+			self.offsets.append(i)
+
+
+	def select(self,
+		require: None | Sequence[Tag] = None,
+		forbid: None | Sequence[Tag] = None
+	) -> list[list[DataPoint]]:
+		"""
+		:param require: tags datapoints must all carry
+		:param forbid: tags datapoints must not carry (any of)
+		:returns: selected datapoints of each list, in their original order
+		"""
+
+		excl: set[int] = set().union(*(self.index.get(t, ()) for t in forbid)) if forbid else set()
+		dps = self.dps
+
+		if not require:
+			return [[dps[j] for j in range(a, b) if j not in excl] for a, b in pairwise(self.offsets)]
+
+		sets = sorted((self.index.get(t, set()) for t in require), key=len)
+		pos = sorted(sets[0].intersection(*sets[1:]) - excl)
+
+		ret = []
+		k = 0
+		for b in self.offsets[1:]:
+			start = k
+			k = bisect_left(pos, b, k)
+			ret.append([dps[j] for j in pos[start:k]])
+
+		return ret
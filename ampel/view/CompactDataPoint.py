@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/view/CompactDataPoint.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, ClassVar
+from weakref import WeakValueDictionary
+
+from ampel.content.DataPoint import DataPoint
+
+_missing: Any = object()
+
+
+class _Schema(dict[str, int]):
+	""" key -> position dict (subclassed to be weakly referenceable) """
+
+
+class CompactBody(Mapping[str, Any]):
+	"""
+	Read-only mapping storing its values in a tuple.
+	Bodies with the same keys (in the same order) share a single key -> position dict,
+	which for homogeneous datapoints (ex: photopoints of a given instrument) is much
+	smaller than a dict per body.
+	"""
+
+	__slots__ = '_keys', '_values'
+
+	#: Shared key -> position dicts by key tuple, discarded once no body references them
+	_schemas: ClassVar[WeakValueDictionary[tuple[str, ...], _Schema]] = WeakValueDictionary()
+
+	_keys: dict[str, int]
+	_values: tuple[Any, ...]
+
+
+	def __init__(self, d: Mapping[str, Any]) -> None:
+		keys = tuple(d)
+		if (schema := self._schemas.get(keys)) is None:
+			schema = self._schemas[keys] = _Schema((k, i) for i, k in enumerate(keys))
+		object.__setattr__(self, '_keys', schema)
+		object.__setattr__(self, '_values', tuple(d.values()))
+
+
+	def __setattr__(self, k, v):
+		raise RuntimeError("Cannot modify CompactBody")
+
+
+	def __getitem__(self, k: str) -> Any:
+		return self._values[self._keys[k]]
+
+
+	def __contains__(self, k: object) -> bool:
+		return k in self._keys
+
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self._keys)
+
+
+	def __len__(self) -> int:
+		return len(self._values)
+
+
+	def __repr__(self) -> str:
+		return f'CompactBody({dict(self)!r})'
+
+
+	def __reduce__(self):
+		return type(self), (dict(self), )
+
+
+class CompactDataPoint(Mapping[str, Any]):
+	"""
+	Read-only, memory efficient alternative to datapoint dicts (see DataPoint),
+	implementing the mapping interface used by DataPoint consumers:
+
+	In []: dp = CompactDataPoint.of({'id': 1, 'channel': ['A'], 'meta': [], 'body': {'jd': 2459000.5}})
+	In []: dp['body']['jd'], dp.get('tag'), 'excl' in dp
+	Out[]: (2459000.5, None, False)
+
+	Keys are stored in slots rather than in a per instance dict, the body is stored as CompactBody.
+	Values other than the body (ex: meta records) are referenced 'as is'.
+	"""
+
+	__slots__ = 'id', 'expiry', 'stock', 'origin', 'tag', 'channel', 'meta', 'excl', 'body'
+
+	fields: ClassVar[tuple[str, ...]] = __slots__
+	_field_set: ClassVar[frozenset[str]] = frozenset(__slots__)
+
+	# Absent keys are set to an internal sentinel
+	id: Any
+	expiry: Any
+	stock: Any
+	origin: Any
+	tag: Any
+	channel: Any
+	meta: Any
+	excl: Any
+	body: CompactBody
+
+
+	@classmethod
+	def of(cls, dp: DataPoint | Mapping[str, Any]) -> "CompactDataPoint":
+		"""
+		:raises ValueError: if dp contains unknown keys
+		"""
+		if isinstance(dp, CompactDataPoint):
+			return dp
+		if not dp.keys() <= cls._field_set:
+			raise ValueError(f"Unknown datapoint keys: {dp.keys() - cls._field_set}")
+		return cls(**dp)
+
+
+	@classmethod
+	def of_many(cls, dps: Iterable[DataPoint | Mapping[str, Any]]) -> list["CompactDataPoint"]:
+		return [cls.of(dp) for dp in dps]
+
+
+	def __init__(self, **kwargs: Any) -> None:
+		sa = object.__setattr__
+		for k in self.fields:
+			v = kwargs.get(k, _missing)
+			sa(self, k, CompactBody(v) if k == 'body' and v is not _missing else v)
+
+
+	def __setattr__(self, k, v):
+		raise RuntimeError("Cannot modify CompactDataPoint")
+
+
+	def __getitem__(self, k: str) -> Any:
+		if k not in self._field_set or (v := getattr(self, k)) is _missing:
+			raise KeyError(k)
+		return v
+
+
+	def __contains__(self, k: object) -> bool:
+		return k in self._field_set and getattr(self, k) is not _missing
+
+
+	def __iter__(self) -> Iterator[str]:
+		return (k for k in self.fields if getattr(self, k) is not _missing)
+
+
+	def __len__(self) -> int:
+		return sum(1 for _ in self)
+
+
+	def __repr__(self) -> str:
+		return f'CompactDataPoint({self.to_dict()!r})'
+
+
+	def __reduce__(self):
+		return _restore, (self.to_dict(), )
+
+
+	def to_dict(self) -> DataPoint:
+		""" :returns: the equivalent datapoint dict (the body is converted into a dict) """
+		return {k: dict(v) if k == 'body' else v for k, v in self.items()} # type: ignore[return-value]
+
+
+def _restore(d: DataPoint) -> CompactDataPoint:
+	return CompactDataPoint.of(d)
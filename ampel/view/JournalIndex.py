@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/view/JournalIndex.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+from ampel.content.JournalRecord import JournalRecord
+from ampel.enum.JournalActionCode import JournalActionCode
+
+
+class JournalIndex:
+	"""
+	Index of the records of a stock journal, allowing to select records
+	by tier, process name and time window without scanning the whole journal.
+
+	In []: ji = JournalIndex(stock['journal'])
+	In []: ji.select(tier=2, since=1700000000)
+	Out[]: [12, 15, 16]  # positions in the journal
+	In []: ji.get_actions(tier=2) & JournalActionCode.T2_ADD_BODY
+	Out[]: <JournalActionCode.T2_ADD_BODY: 262144>
+	"""
+
+	__slots__ = 'journal', 'tiers', 'processes', 'ts', 'order'
+
+	journal: Sequence[JournalRecord]
+
+	#: tier -> positions of the associated records
+	tiers: dict[int, list[int]]
+
+	#: process name -> positions of the associated records
+	processes: dict[int | str, list[int]]
+
+	#: sorted timestamps
+	ts: list[float]
+
+	#: positions of the records sorted by timestamp (stable), None if the journal is chronologically ordered
+	order: None | list[int]
+
+
+	def __init__(self, journal: Sequence[JournalRecord]) -> None:
+
+		self.journal = journal
+		self.tiers = {}
+		self.processes = {}
+
+		ts = []
+		for i, je in enumerate(journal):
+			self.tiers.setdefault(je['tier'], []).append(i)
+			if 'process' in je:
+				self.processes.setdefault(je['process'], []).append(i)
+			ts.append(je['ts'])
+
+		if all(ts[i] <= ts[i + 1] for i in range(len(ts) - 1)):
+			self.order = None
+			self.ts = ts
+		else:
+			self.order = sorted(range(len(ts)), key=ts.__getitem__)
+			self.ts = [ts[i] for i in self.order]
+
+
+	def __len__(self) -> int:
+		return len(self.journal)
+
+
+	def select(self,
+		tier: None | int = None,
+		process_name: None | int | str = None,
+		since: None | float = None,
+		until: None | float = None
+	) -> Sequence[int]:
+		"""
+		:param since: min timestamp (inclusive)
+		:param until: max timestamp (inclusive)
+		:returns: positions (in the journal, ascending) of the matching records (never the index's own lists)
+		"""
+
+		candidates: list[Sequence[int]] = []
+
+		if tier is not None:
+			candidates.append(self.tiers.get(tier, []))
+
+		if process_name:
+			candidates.append(self.processes.get(process_name, []))
+
+		if since is not None or until is not None:
+			lo = 0 if since is None else bisect_left(self.ts, since)
+			hi = len(self.ts) if until is None else bisect_right(self.ts, until)
+			candidates.append(
+				range(lo, hi) if self.order is None
+				else sorted(self.order[lo:hi])
+			)
+
+		if not candidates:
+			return range(len(self.journal))
+
+		if len(candidates) == 1:
+			# Copy: callers must not be able to alter the index
+			return tuple(candidates[0])
+
+		# Filter the smallest candidate set using the other criteria
+		pos = min(candidates, key=len)
+		j = self.journal
+		return [
+			i for i in pos
+			if (tier is None or j[i]['tier'] == tier) and
+			(not process_name or j[i].get('process') == process_name) and
+			(since is None or j[i]['ts'] >= since) and
+			(until is None or j[i]['ts'] <= until)
+		]
+
+
+	def first(self) -> JournalRecord:
+		""" :returns: the earliest record """
+		return self.journal[0 if self.order is None else self.order[0]]
+
+
+	def last(self) -> JournalRecord:
+		""" :returns: the latest record """
+		return self.journal[-1 if self.order is None else self.order[-1]]
+
+
+	def get_actions(self,
+		tier: None | int = None,
+		process_name: None | int | str = None,
+		since: None | float = None,
+		until: None | float = None
+	) -> JournalActionCode:
+		"""
+		:returns: the union (bitwise or) of the action codes of the matching records
+		"""
+		j = self.journal
+		ret = 0
+		for i in self.select(tier, process_name, since, until):
+			ret |= j[i].get('action', 0)
+		return JournalActionCode(ret)
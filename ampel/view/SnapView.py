@@ -8,9 +8,11 @@
 # Last Modified By:    simeon reusch
 
 from collections.abc import Callable, Container, Iterator, Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Literal, overload
+from typing import TYPE_CHECKING, Annotated, Any, Literal, overload
+
+from pydantic import Field
 
 from ampel.config.AmpelConfig import AmpelConfig
 from ampel.content.DataPoint import DataPoint
@@ -20,7 +22,10 @@ from ampel.content.StockDocument import StockDocument
 from ampel.content.T1Document import T1Document
 from ampel.struct.AmpelBuffer import AmpelBuffer
 from ampel.types import OneOrMany, StockId, T2Link, TBson, UBson
+from ampel.util.datapoints import DPColumnsOutput, dp_columns
+from ampel.util.freeze import FreezePool
 from ampel.util.freeze import recursive_freeze as rf
+from ampel.view.JournalIndex import JournalIndex
 from ampel.view.T2DocView import T2DocView
 
 if TYPE_CHECKING:
@@ -54,16 +59,35 @@ class SnapView:
 	# Free-form information addable via instances of AbsBufferComplement
 	extra: None | dict[str, Any] = None
 
+	#: Datapoint columns computed by get_t0_columns
+	_t0_columns: Annotated[None | dict[tuple, Any], Field(exclude=True)] = field(
+		default=None, init=False, repr=False, compare=False
+	)
+
+	#: Index of the stock journal (JournalIndex) built by get_journal_index
+	_journal_index: Annotated[Any, Field(exclude=True)] = field(
+		default=None, init=False, repr=False, compare=False
+	)
+
 
 	@classmethod
-	def of(cls, ab: AmpelBuffer, conf: None | AmpelConfig = None, freeze: bool = True) -> "Self":
+	def of(cls,
+		ab: AmpelBuffer,
+		conf: None | AmpelConfig = None,
+		freeze: bool = True,
+		pool: None | FreezePool = None
+	) -> "Self":
+		"""
+		:param pool: optional pool through which datapoints are frozen, allowing views
+		sharing datapoints (overlapping selections, hybrid stocks) to share frozen instances
+		"""
 
 		if freeze:
 			return cls(
 				id = ab['id'],
 				stock = rf(ab['stock']) if ab.get('stock') else None,
 				origin = ab.get('origin'),
-				t0 = tuple(rf(el) for el in ab['t0']) if ab.get('t0') else None, # type: ignore[union-attr]
+				t0 = tuple(rf(el, pool) for el in ab['t0']) if ab.get('t0') else None, # type: ignore[union-attr]
 				t1 = tuple(rf(el) for el in ab['t1']) if ab.get('t1') else None, # type: ignore[union-attr]
 				t2 = tuple(T2DocView.of(rf(el), conf) for el in ab['t2']) if ab.get('t2') else None, # type: ignore[union-attr]
 				logs = tuple(rf(el) for el in ab['logs']) if ab.get('logs') else None, # type: ignore[union-attr]
@@ -242,59 +266,92 @@ class SnapView:
 		return None
 
 
+	def get_t0_columns(self,
+		fields: Sequence[str],
+		sort: None | str = None,
+		output: DPColumnsOutput = 'numpy',
+		dtype: None | str | Mapping[str, str] = None
+	) -> Any:
+		"""
+		Extracts body fields of the datapoints referenced by this view into columns (see dp_columns).
+		Results are cached on the view, returned numpy arrays are read-only.
+
+		In []: view.get_t0_columns(['jd', 'magpsf', 'sigmapsf', 'fid'], sort='jd')
+		Out[]: {'jd': array([2459000.5, 2459001.7]), 'magpsf': array([18.2, 18.1]), ...}
+		"""
+
+		key = (
+			tuple(fields), sort, output,
+			dtype if dtype is None or isinstance(dtype, str) else tuple(sorted(dtype.items()))
+		)
+
+		if (cache := self._t0_columns) is None:
+			cache = {}
+			object.__setattr__(self, '_t0_columns', cache)
+		elif key in cache:
+			return cache[key]
+
+		ret = cache[key] = dp_columns(self.t0 or (), fields, sort, output, dtype, readonly=True)
+		return ret
+
+
 	def get_journal_entries(self,
 		tier: None | Literal[0, 1, 2, 3] = None,
 		process_name: None | str = None,
 		filter_func: None | Callable[[JournalRecord], bool] = None,
+		since: None | float = None,
+		until: None | float = None
 	) -> Iterator[JournalRecord]:
 		"""
 		Get a subset of journal entries.
 
 		:param tier: return only journal entries associated with the given tier
 		:param process_name: return only journal entries associated with a given process name
-		:param latest: return only the latest entry in the journal (the latest in time)
+		:param since: return only journal entries with a timestamp >= since
+		:param until: return only journal entries with a timestamp <= until
 
 		:returns:
 			journal entries corresponding to a given tier and/or job,
-			sorted by timestamp.
+			in journal order.
 		"""
 
-		if not self.stock:
+		if not (ji := self.get_journal_index()):
 			return None
 
-		# Journal entries are sorted chronologically
-		for je in self.stock['journal']:
-
-			if tier is not None and je['tier'] != tier:
+		j = ji.journal
+		for i in ji.select(tier, process_name, since, until):
+			if filter_func and not filter_func(j[i]):
 				continue
+			yield j[i]
 
-			if process_name and je['process'] != process_name:
-				continue
-
-			if filter_func and not filter_func(je):
-				continue
 
-			yield je
+	def get_journal_index(self) -> None | JournalIndex:
+		"""
+		:returns: an index of the stock journal (built on first call), None if this view has no stock document
+		"""
+		if self._journal_index is None and self.stock:
+			object.__setattr__(self, '_journal_index', JournalIndex(self.stock['journal']))
+		return self._journal_index
 
 
 	def get_time_created(self,
 		output: Literal['raw', 'datetime', 'str'] = 'raw'
 	) -> None | float | datetime | str:
 
-		if not self.stock:
+		if not (ji := self.get_journal_index()):
 			return None
 		# Journal cannot be empty
-		return self._get_time(self.stock['journal'][0], output)
+		return self._get_time(ji.first(), output)
 
 
 	def get_time_updated(self,
 		output: Literal['raw', 'datetime', 'str'] = 'raw'
 	) -> None | float | datetime | str:
 
-		if not self.stock:
+		if not (ji := self.get_journal_index()):
 			return None
 		# Journal cannot be empty
-		return self._get_time(self.stock['journal'][-1], output)
+		return self._get_time(ji.last(), output)
 
 
 	@classmethod
@@ -8,9 +8,11 @@
 # Last Modified By:    valery brinnel <firstname.lastname@gmail.com>
 
 from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Literal, overload
+from typing import TYPE_CHECKING, Annotated, Any, Literal, overload
+
+from pydantic import Field
 
 from ampel.config.AmpelConfig import AmpelConfig
 from ampel.content.MetaRecord import MetaRecord
@@ -44,6 +46,11 @@ class T2DocView:
 	meta: Sequence[MetaRecord]
 	body: None | Sequence[UBson] = None
 
+	#: Body positions by meta code filter, computed on first access (see get_payload)
+	_body_idx: Annotated[None | dict[None | int, int], Field(exclude=True)] = field(
+		default=None, init=False, repr=False, compare=False
+	)
+
 
 	@classmethod # Static ctor
 	def of(cls, doc: T2Document, conf: None | AmpelConfig = None) -> "Self":
@@ -112,22 +119,7 @@ class T2DocView:
 				raise ValueError("T2 doc has no body")
 			return None
 
-		idx = len(
-			[
-				el for el in self.meta
-				if el['tier'] == 2 and
-				(el['code'] >= 0 if code is None else el['code'] == code)
-			]
-		) - 1
-
-		if idx == -1:
-			if raise_exc:
-				raise ValueError("No content available")
-			return None
-
-		# A manual/admin $unset: {body: 1} was used to delete bad data
-		idx = min(idx, len(self.body) - 1)
-		if idx < 0:
+		if (idx := self.get_body_index(code)) < 0:
 			if raise_exc:
 				raise ValueError("No content available")
 			return None
@@ -135,6 +127,33 @@ class T2DocView:
 		return self.body[idx]
 
 
+	def get_body_index(self, code: None | int = None) -> int:
+		"""
+		:returns: the position in body of the payload associated with the last meta record (tier 2)
+		having a code >= 0 (code is None) or equals code arg, -1 if no such payload exists.
+		Positions for all codes are computed in one pass over meta on first call.
+		"""
+
+		if (bidx := self._body_idx) is None:
+
+			n = 0
+			counts: dict[None | int, int] = {}
+			for el in self.meta:
+				if el['tier'] == 2:
+					c = el['code']
+					counts[c] = counts.get(c, 0) + 1
+					if c >= 0:
+						n += 1
+			counts[None] = n
+
+			# A manual/admin $unset: {body: 1} was used to delete bad data
+			last = len(self.body) - 1 if self.body else -1
+			bidx = {k: min(v - 1, last) for k, v in counts.items()}
+			object.__setattr__(self, '_body_idx', bidx)
+
+		return bidx.get(code, -1)
+
+
 	def is_point_type(self) -> bool:
 		return self.t2_type == TYPE_POINT_T2
 
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/ampel/view/T2Table.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Literal
+
+from ampel.model.T2ColumnModel import T2ColumnModel
+from ampel.types import StockId
+from ampel.util.mappings import compile_path
+from ampel.view.SnapView import SnapView
+
+try:
+	import numpy as np
+	HAVE_NUMPY = True
+except ImportError:
+	HAVE_NUMPY = False
+
+try:
+	import pyarrow as pa
+	HAVE_PYARROW = True
+except ImportError:
+	HAVE_PYARROW = False
+
+if TYPE_CHECKING:
+	from typing import Self
+
+
+_missing = object()
+
+_accepts: dict[str, Callable[[Any], bool]] = {
+	'float': lambda v: isinstance(v, int | float) and not isinstance(v, bool),
+	'int': lambda v: isinstance(v, int) and not isinstance(v, bool),
+	'bool': lambda v: isinstance(v, bool),
+	'str': lambda v: isinstance(v, str),
+	'object': lambda v: True
+}
+
+# Values standing in for missing values
+_fill: dict[str, Any] = {'float': float('nan'), 'int': 0, 'bool': False, 'str': None, 'object': None}
+_np_dtypes = {'float': 'float64', 'int': 'int64', 'bool': 'bool', 'str': 'object', 'object': 'object'}
+
+
+@dataclass(frozen=True, slots=True)
+class T2Table:
+	"""
+	Columnar projection of T2 results built out of a stream of SnapViews, one row per view.
+
+	In []: t = T2Table.of(
+		views,
+		{
+			'z': T2ColumnModel(unit=('T2NedSNCosmo', 'T2SNCosmo'), path='fit_result.z'),
+			'ndof': T2ColumnModel(unit='T2SNCosmo', path='fit_result.ndof', dtype='int')
+		}
+	)
+	In []: t.stock
+	Out[]: array([1020, 1021, 1022])
+	In []: t.columns['z']
+	Out[]: array([0.05, nan, 0.12])
+	In []: t.null['z']
+	Out[]: array([False, True, False])
+
+	Views are consumed in a single pass. At most batch_size rows are held as python objects
+	at any time, completed batches are converted into compact numpy arrays.
+	iter_batches allows to process arbitrarily large streams with constant memory, for example:
+	pyarrow.concat_tables(t.to_arrow() for t in T2Table.iter_batches(views, columns))
+	"""
+
+	#: Stock ids, one per row
+	stock: "Sequence[StockId] | np.ndarray"
+
+	#: Column values. Missing values are set to NaN (float), 0 (int), False (bool) or None (str, object)
+	columns: "dict[str, Sequence[Any] | np.ndarray]"
+
+	#: Null masks (True: value missing)
+	null: "dict[str, Sequence[bool] | np.ndarray]"
+
+	#: Column types (see T2ColumnModel.dtype)
+	dtypes: dict[str, str]
+
+
+	def __len__(self) -> int:
+		return len(self.stock)
+
+
+	@classmethod
+	def of(cls,
+		views: Iterable[SnapView],
+		columns: Mapping[str, T2ColumnModel | dict[str, Any]],
+		backend: Literal['numpy', 'list'] = 'numpy',
+		batch_size: int = 4096
+	) -> "Self":
+		"""
+		:param columns: column name -> projection spec (reserved name: 'stock')
+		:param backend: whether columns and masks should be numpy arrays or python lists
+		"""
+
+		specs = cls._specs(columns)
+		batches = list(cls._iter(views, specs, backend, batch_size))
+
+		if not batches:
+			return cls._build([], [[] for _ in specs], specs, backend)
+
+		if len(batches) == 1:
+			return batches[0]
+
+		cat: Callable[[list[Any]], Any] = (
+			np.concatenate if backend == 'numpy'
+			else lambda seqs: list(chain.from_iterable(seqs))
+		)
+
+		return cls(
+			stock = cat([b.stock for b in batches]),
+			columns = {k: cat([b.columns[k] for b in batches]) for k in specs},
+			null = {k: cat([b.null[k] for b in batches]) for k in specs},
+			dtypes = batches[0].dtypes
+		)
+
+
+	@classmethod
+	def iter_batches(cls,
+		views: Iterable[SnapView],
+		columns: Mapping[str, T2ColumnModel | dict[str, Any]],
+		backend: Literal['numpy', 'list'] = 'numpy',
+		batch_size: int = 4096
+	) -> Iterator["Self"]:
+		""" Yields tables of (at most) batch_size rows """
+		return cls._iter(views, cls._specs(columns), backend, batch_size)
+
+
+	@staticmethod
+	def _specs(columns: Mapping[str, T2ColumnModel | dict[str, Any]]) -> dict[str, T2ColumnModel]:
+		if 'stock' in columns:
+			raise ValueError("Column name 'stock' is reserved")
+		return {
+			k: v if isinstance(v, T2ColumnModel) else T2ColumnModel(**v)
+			for k, v in columns.items()
+		}
+
+
+	@classmethod
+	def _iter(cls,
+		views: Iterable[SnapView],
+		specs: dict[str, T2ColumnModel],
+		backend: Literal['numpy', 'list'],
+		batch_size: int
+	) -> Iterator["Self"]:
+
+		if backend == 'numpy' and not HAVE_NUMPY:
+			raise ValueError("numpy is not installed")
+
+		ncol = len(specs)
+		getters = [compile_path(s.path).get for s in specs.values()]
+		accepts = [_accepts[s.dtype] for s in specs.values()]
+		codes = [s.code for s in specs.values()]
+
+		# unit name -> indexes of the columns it can provide values for
+		by_unit: dict[int | str, list[int]] = {}
+		for i, s in enumerate(specs.values()):
+			for u in ((s.unit, ) if isinstance(s.unit, str) else s.unit):
+				by_unit.setdefault(u, []).append(i)
+
+		stock: list[StockId] = []
+		values: list[list[Any]] = [[] for _ in range(ncol)]
+
+		for view in views:
+
+			row = [_missing] * ncol
+
+			if view.t2:
+				left = ncol
+				for t2v in view.t2:
+					if (idx := by_unit.get(t2v.unit)) is None:
+						continue
+					for i in idx:
+						if (
+							row[i] is _missing and
+							(p := t2v.get_payload(code=codes[i])) is not None and
+							(v := getters[i](p)) is not None and
+							accepts[i](v)
+						):
+							row[i] = v
+							left -= 1
+					if not left:
+						break
+
+			stock.append(view.id)
+			for i in range(ncol):
+				values[i].append(row[i])
+
+			if len(stock) == batch_size:
+				yield cls._build(stock, values, specs, backend)
+				stock = []
+				values = [[] for _ in range(ncol)]
+
+		if stock:
+			yield cls._build(stock, values, specs, backend)
+
+
+	@classmethod
+	def _build(cls,
+		stock: list[StockId],
+		values: list[list[Any]],
+		specs: dict[str, T2ColumnModel],
+		backend: Literal['numpy', 'list']
+	) -> "Self":
+
+		columns: dict[str, Any] = {}
+		null: dict[str, Any] = {}
+		n = len(stock)
+
+		for (k, spec), vals in zip(specs.items(), values, strict=True):
+			fill = _fill[spec.dtype]
+			mask = [v is _missing for v in vals]
+			col = [fill if v is _missing else v for v in vals]
+			if backend == 'numpy':
+				columns[k] = np.fromiter(col, dtype=_np_dtypes[spec.dtype], count=n)
+				null[k] = np.fromiter(mask, dtype=bool, count=n)
+			else:
+				columns[k] = col
+				null[k] = mask
+
+		return cls(
+			stock = np.fromiter(
+				stock, count=n,
+				dtype='int64' if all(type(el) is int for el in stock) else 'object'
+			) if backend == 'numpy' else stock,
+			columns = columns,
+			null = null,
+			dtypes = {k: spec.dtype for k, spec in specs.items()}
+		)
+
+
+	def masked(self, name: str) -> "np.ma.MaskedArray":
+		""" :returns: the values of the given column as numpy masked array """
+		if not HAVE_NUMPY:
+			raise ValueError("numpy is not installed")
+		return np.ma.MaskedArray(
+			np.asarray(self.columns[name], dtype=_np_dtypes[self.dtypes[name]]),
+			mask=np.asarray(self.null[name], dtype=bool)
+		)
+
+
+	def to_arrow(self) -> "pa.Table":
+		""" :returns: a pyarrow table with a 'stock' column followed by the projected columns """
+
+		if not HAVE_PYARROW:
+			raise ValueError("pyarrow is not installed")
+
+		types = {'float': pa.float64(), 'int': pa.int64(), 'bool': pa.bool_(), 'str': pa.string(), 'object': None}
+		data = {'stock': pa.array(self.stock)}
+		for k, col in self.columns.items():
+			data[k] = pa.array(
+				[None if m else v for v, m in zip(col, self.null[k], strict=True)]
+				if isinstance(col, list) else col,
+				type = types[self.dtypes[k]],
+				mask = None if isinstance(col, list) else self.null[k]
+			)
+		return pa.table(data)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/benchmarks/bench_idmapper.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+"""
+Benchmark harness for AbsIdMapper subclasses comparing per-id conversions with batch conversions.
+Round trips (external id -> ampel id -> external id) are checked for consistency.
+
+Usage:
+python benchmarks/bench_idmapper.py [module:MapperClass] [--ids path/to/ext_ids.txt] [-n 100000] [--number 5]
+
+Without mapper, two demo mappers are benchmarked: one converting hexadecimal names arithmetically
+(caching does not pay off) and one simulating costly lookups (caching pays off for recurring ids).
+Without ids file (one external id per line), ids are generated using the to_ext_id method of the mapper
+with a fraction of duplicates (--dup) mimicking repeated exports of the same stocks.
+"""
+
+import random
+import sys
+from hashlib import blake2b
+from argparse import ArgumentParser
+from collections.abc import Callable
+from importlib import import_module
+from timeit import timeit
+from typing import Any, ClassVar
+
+from ampel.abstract.AbsIdMapper import AbsIdMapper
+from ampel.util.idmapping import IdMapperCache
+
+
+class DemoMapper(AbsIdMapper):
+
+	@classmethod
+	def to_ampel_id(cls, ext_id):
+		return int(ext_id[3:], 16) if isinstance(ext_id, str) else [int(el[3:], 16) for el in ext_id]
+
+	@classmethod
+	def to_ext_id(cls, ampel_id):
+		return f'AMP{ampel_id:x}' if isinstance(ampel_id, int) else [f'AMP{el:x}' for el in ampel_id]
+
+
+class LookupDemoMapper(DemoMapper):
+	""" Simulates mappers performing lookups (ex: database queries) with a per-id cost """
+
+	@staticmethod
+	def _lookup(v: Any) -> None:
+		for _ in range(5):
+			blake2b(str(v).encode()).digest()
+
+	@classmethod
+	def to_ampel_id(cls, ext_id):
+		for el in [ext_id] if isinstance(ext_id, str) else ext_id:
+			cls._lookup(el)
+		return super().to_ampel_id(ext_id)
+
+	@classmethod
+	def to_ext_id(cls, ampel_id):
+		for el in [ampel_id] if isinstance(ampel_id, int) else ampel_id:
+			cls._lookup(el)
+		return super().to_ext_id(ampel_id)
+
+
+def bench(Mapper: type[AbsIdMapper], ext_ids: list[str], number: int) -> None:
+
+	class CachedMapper(IdMapperCache, Mapper): # type: ignore[valid-type,misc]
+		id_cache_size: ClassVar[int] = len(ext_ids)
+
+	print(f"{Mapper.__name__}:") # noqa: T201
+	ampel_ids = Mapper.to_ampel_ids(ext_ids)
+	if ampel_ids != [Mapper.to_ampel_id(el) for el in ext_ids]:
+		sys.exit("to_ampel_ids output differs from to_ampel_id")
+	if (back := Mapper.to_ext_ids(ampel_ids)) != [Mapper.to_ext_id(el) for el in ampel_ids]:
+		sys.exit("to_ext_ids output differs from to_ext_id")
+	if back != ext_ids:
+		print("Warning: round trip does not restore external ids (non canonical names?)") # noqa: T201
+
+	_time('to_ampel_id', Mapper.to_ampel_id, Mapper.to_ampel_ids, CachedMapper.to_ampel_ids, ext_ids, number)
+	_time('to_ext_id', Mapper.to_ext_id, Mapper.to_ext_ids, CachedMapper.to_ext_ids, ampel_ids, number)
+
+
+def _time(
+	name: str,
+	func: Callable[[Any], Any],
+	fbatch: Callable[[Any], list[Any]],
+	fcached: Callable[[Any], list[Any]],
+	values: list[Any],
+	number: int
+) -> None:
+	t_scalar = timeit(lambda: [func(el) for el in values], number=number)
+	t_iter = timeit(lambda: func(values), number=number)
+	t_batch = timeit(lambda: fbatch(values), number=number)
+	t_cached = timeit(lambda: fcached(values), number=number)
+	print( # noqa: T201
+		f"{name:<12} n={len(values)} per-id: {t_scalar:.4f}s iterable: {t_iter:.4f}s "
+		f"batch: {t_batch:.4f}s cached batch: {t_cached:.4f}s"
+	)
+
+
+def main() -> None:
+
+	parser = ArgumentParser(description=__doc__.split('\n')[1])
+	parser.add_argument('mapper', nargs='?', help='mapper class, ex: ampel.ztf.util.ZTFIdMapper:ZTFIdMapper')
+	parser.add_argument('--ids', help='path to a file containing external ids (one per line)')
+	parser.add_argument('-n', type=int, default=100_000, help='number of generated ids')
+	parser.add_argument('--dup', type=float, default=0.2, help='fraction of duplicated generated ids')
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--number', type=int, default=5, help='timeit number of executions')
+	args = parser.parse_args()
+
+	mappers: list[type[AbsIdMapper]] = [DemoMapper, LookupDemoMapper]
+	if args.mapper:
+		mod, _, cls = args.mapper.partition(':')
+		mappers = [getattr(import_module(mod), cls or mod.split('.')[-1])]
+
+	if args.ids:
+		with open(args.ids) as f:
+			ext_ids = [line.strip() for line in f if line.strip()]
+	else:
+		rng = random.Random(args.seed)
+		ampel_ids = [rng.randint(1, 2**40) for _ in range(args.n)]
+		for i in range(int(args.n * args.dup)):
+			ampel_ids[i] = rng.choice(ampel_ids)
+		ext_ids = mappers[0].to_ext_ids(ampel_ids)
+
+	for Mapper in mappers:
+		bench(Mapper, ext_ids, args.number)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# File:                Ampel-interface/benchmarks/bench_mappings.py
+# License:             BSD-3-Clause
+# Author:              agent <agent@local>
+# Date:                19.10.2026
+# Last Modified Date:  19.10.2026
+# Last Modified By:    agent <agent@local>
+
+"""
+Micro-benchmark comparing flatten_dict / unflatten_dict against their former recursive implementation.
+Outputs (including key order, which matters for build_unsafe_dict_id) are checked for equality.
+
+Usage:
+python benchmarks/bench_mappings.py [path/to/ampel_conf.yaml] [--number 20]
+
+Without config path, a synthetic config resembling an ampel process section is used.
+"""
+
+import json
+import sys
+from argparse import ArgumentParser
+from collections.abc import Mapping, MutableMapping
+from contextlib import suppress
+from itertools import product
+from timeit import timeit
+from typing import Any
+
+import yaml
+
+from ampel.types import strict_iterable
+from ampel.util.mappings import flatten_dict, unflatten_dict
+
+
+def legacy_flatten_dict(
+	d: Mapping, separator: str = '.', sort_keys: bool = False,
+	flatten_list_members: bool = False, flatten_lists: bool = False, sort_lists: bool = False
+) -> MutableMapping:
+	""" Former recursive implementation (reference) """
+	try:
+		out = {}
+		for k in sorted(d.keys()) if sort_keys else d:
+			v = d[k]
+			if isinstance(v, dict):
+				for kk, vv in legacy_flatten_dict(
+					v, separator, sort_keys, flatten_list_members, flatten_lists, sort_lists
+				).items():
+					out[f'{k}{separator}{kk}'] = vv
+			elif isinstance(v, strict_iterable):
+				if flatten_list_members:
+					v = [
+						legacy_flatten_dict(el, separator, sort_keys, flatten_list_members, flatten_lists, sort_lists)
+						if isinstance(el, dict) else el
+						for el in v
+					]
+				if sort_lists:
+					with suppress(Exception):
+						v = sorted(v, key=str)
+					if flatten_list_members and all(isinstance(el, dict) for el in v):
+						v = sorted(v, key=lambda x: next(iter(x.keys())))
+				if flatten_lists:
+					for kk, vv in legacy_flatten_dict(
+						{i: v[i] for i in range(len(v))},
+						separator, sort_keys, flatten_list_members, flatten_lists, sort_lists
+					).items():
+						out[f'{k}{separator}{kk}'] = vv
+				else:
+					out[k] = v
+			else:
+				out[k] = v
+		return out
+	except Exception as e:
+		raise ValueError(f"Offending input: {d}") from e
+
+
+def legacy_unflatten_dict(d: Mapping[str, Any], separator: str = '.') -> MutableMapping[str, Any]:
+	out: dict[str, Any] = {}
+	for key in d:
+		parts = key.split(separator)
+		target: dict[str, Any] = out
+		for part in parts[:-1]:
+			if part not in target:
+				target[part] = {}
+			target = target[part]
+		target[parts[-1]] = d[key]
+	return out
+
+
+def synthetic_config(n: int = 50) -> dict[str, Any]:
+	return {
+		'process': {
+			f't3_proc_{i}': {
+				'name': f't3_proc_{i}', 'tier': 3, 'schedule': ['every(30).minutes'], 'channel': None,
+				'processor': {'unit': 'T3Processor', 'config': {
+					'supply': {'unit': 'T3DefaultBufferSupplier', 'config': {
+						'select': {'unit': 'T3StockSelector', 'config': {
+							'updated': {'after': {'match_type': 'time_last_run', 'process_name': 't3'}},
+							'channel': f'CHAN_{i}', 'tag': {'with': 'ZTF', 'without': 'HAS_ERROR'}
+						}},
+						'load': {'unit': 'T3SimpleDataLoader', 'config': {'directives': [
+							{'col': 'stock'}, {'col': 't0'}, {'col': 't1'},
+							{'col': 't2', 'query_complement': {'unit': {'$in': ['T2LightCurveSummary', 'T2SNCosmo']}}}
+						]}}
+					}},
+					'stage': {'unit': 'T3SimpleStager', 'config': {'execute': [
+						{'unit': 'SlackSummaryPublisher', 'config': {
+							'excitement': {'Low': 50, 'Mid': 200, 'High': 400},
+							'cols': ['ztf_name', 'ra', 'dec', 'magpsf', 'sgscore1', 'rb', i]
+						}}
+					]}}
+				}}
+			}
+			for i in range(n)
+		}
+	}
+
+
+def main() -> None:
+
+	parser = ArgumentParser(description=__doc__.split('\n')[1])
+	parser.add_argument('config', nargs='?', help='path to an ampel config file (yaml or json)')
+	parser.add_argument('--number', type=int, default=20, help='timeit number of executions')
+	args = parser.parse_args()
+
+	if args.config:
+		with open(args.config) as f:
+			conf = json.load(f) if args.config.endswith('.json') else yaml.safe_load(f)
+	else:
+		conf = synthetic_config()
+
+	# Config sections are benchmarked individually as well as at once
+	docs = {'all': conf} | {k: v for k, v in conf.items() if isinstance(v, dict) and v}
+
+	for name, d in docs.items():
+		# (sort_keys, flatten_list_members, flatten_lists, sort_lists)
+		for opts in product((False, True), repeat=4):
+
+			try:
+				ref = legacy_flatten_dict(d, '.', *opts)
+			except ValueError:
+				continue
+
+			new = flatten_dict(d, '.', *opts)
+			if list(ref.items()) != list(new.items()):
+				sys.exit(f"Output mismatch for section {name!r} with options {opts}")
+
+			t_ref = timeit(lambda: legacy_flatten_dict(d, '.', *opts), number=args.number) # noqa: B023
+			t_new = timeit(lambda: flatten_dict(d, '.', *opts), number=args.number) # noqa: B023
+			print( # noqa: T201
+				f"flatten_dict   {name:<12} {opts!s:<28} "
+				f"legacy: {t_ref:.4f}s new: {t_new:.4f}s speedup: {t_ref / t_new:.2f}"
+			)
+
+		flat = {str(k): v for k, v in flatten_dict(d).items()}
+		if legacy_unflatten_dict(flat) != unflatten_dict(flat):
+			sys.exit(f"unflatten_dict output mismatch for section {name!r}")
+
+		t_ref = timeit(lambda: legacy_unflatten_dict(flat), number=args.number) # noqa: B023
+		t_new = timeit(lambda: unflatten_dict(flat), number=args.number) # noqa: B023
+		print( # noqa: T201
+			f"unflatten_dict {name:<12} {'':<28} "
+			f"legacy: {t_ref:.4f}s new: {t_new:.4f}s speedup: {t_ref / t_new:.2f}"
+		)
+
+
+if __name__ == '__main__':
+	main()
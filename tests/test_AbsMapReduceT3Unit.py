@@ -0,0 +1,79 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any
+
+from ampel.abstract.AbsMapReduceT3Unit import AbsMapReduceT3Unit, MapResult
+from ampel.struct.JournalAttributes import JournalAttributes
+from ampel.struct.StockAttributes import StockAttributes
+from ampel.struct.T3Store import T3Store
+from ampel.struct.UnitResult import UnitResult
+from ampel.types import UBson
+from ampel.view.SnapView import SnapView
+from ampel.view.T3DocView import T3DocView
+
+
+class ViewGenerator:
+    """Mimics the view generators of the framework: send() records updates without advancing"""
+
+    def __init__(self, n: int) -> None:
+        self.it = iter([SnapView(id=i) for i in range(n)])
+        self.sent: list[Any] = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> SnapView:
+        return next(self.it)
+
+    def send(self, arg: Any) -> None:
+        self.sent.append(arg)
+
+
+class PicklableLogger(logging.Logger):
+    verbose = 0
+
+    def __reduce__(self):
+        return PicklableLogger, (self.name,)
+
+
+class SumIds(AbsMapReduceT3Unit):
+    def map(self, view: SnapView, t3s: T3Store) -> MapResult:
+        return view.id, JournalAttributes(code=1) if view.id % 3 == 0 else None
+
+    def reduce(self, partials: list[Any], t3s: T3Store) -> UBson | UnitResult:
+        return {"sum": sum(partials), "n": len(partials)}
+
+
+def test_process(mocker):
+    unit = SumIds(logger=mocker.MagicMock(), chunk_size=4)
+    for n in (0, 10):
+        gen = ViewGenerator(n)
+        assert unit.process(gen, T3Store()) == {"sum": sum(range(n)), "n": n}  # type: ignore[arg-type]
+        assert [stock for stock, _ in gen.sent] == list(range(0, n, 3))
+        assert all(isinstance(sa, StockAttributes) and sa.journal.code == 1 for _, sa in gen.sent)
+
+
+def test_process_parallel(mocker):
+    unit = SumIds(logger=mocker.MagicMock(), chunk_size=3, max_pending=2)
+    gen = ViewGenerator(100)
+    with ThreadPoolExecutor(4) as executor:
+        assert unit.process_parallel(gen, T3Store(), executor) == {"sum": 4950, "n": 100}  # type: ignore[arg-type]
+    assert [stock for stock, _ in gen.sent] == list(range(0, 100, 3))
+
+
+class SumIdsOffset(SumIds):
+    def map(self, view: SnapView, t3s: T3Store) -> MapResult:
+        offset = t3s.get_mandatory_view("Offset").body
+        assert isinstance(offset, int)
+        assert t3s.session == {"run": 1}
+        return view.id + offset, super().map(view, t3s)[1]
+
+
+def test_process_parallel_processes():
+    unit = SumIdsOffset(logger=PicklableLogger("test"), chunk_size=10)
+    gen = ViewGenerator(50)
+    t3s = T3Store([T3DocView(unit="Offset", confid=0, code=0, meta={}, body=1)], session={"run": 1})
+    with ProcessPoolExecutor(2, mp_context=get_context("spawn")) as executor:
+        assert unit.process_parallel(gen, t3s, executor) == {"sum": 1275, "n": 50}  # type: ignore[arg-type]
+    assert [stock for stock, _ in gen.sent] == list(range(0, 50, 3))
@@ -0,0 +1,34 @@
+from collections.abc import Sequence
+
+import pytest
+
+from ampel.abstract.AbsPointT2Unit import AbsPointT2Unit
+from ampel.content.DataPoint import DataPoint
+from ampel.struct.UnitResult import UnitResult
+from ampel.types import UBson
+
+
+class PointUnit(AbsPointT2Unit):
+    def process(self, datapoint: DataPoint) -> UBson | UnitResult:
+        return {"id": datapoint["id"]}
+
+
+def test_process_batch(mocker):
+    unit = PointUnit(logger=mocker.MagicMock())
+    dps: list[DataPoint] = [{"id": i, "channel": [], "meta": [], "body": {}} for i in range(3)]
+    assert unit.process_batch(dps) == [{"id": i} for i in range(3)]
+
+
+def test_process_batch_override(mocker):
+    class BatchUnit(PointUnit):
+        def process_batch(self, datapoints: Sequence[DataPoint]) -> list[UBson | UnitResult]:
+            return [{"n": len(datapoints)}] * len(datapoints)
+
+    unit = BatchUnit(logger=mocker.MagicMock())
+    assert unit.process_batch([{"id": 0, "channel": [], "meta": [], "body": {}}]) == [{"n": 1}]
+
+    with pytest.raises(TypeError, match="Wrong method signature"):
+
+        class WrongSignature(PointUnit):
+            def process_batch(self, datapoints, extra):  # type: ignore[override]
+                return []
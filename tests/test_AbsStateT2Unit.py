@@ -2,6 +2,7 @@
 from typing_extensions import TypedDict
 
 from ampel.abstract.AbsStateT2Unit import AbsStateT2Unit
+from ampel.abstract.AbsTiedStateT2Unit import AbsTiedStateT2Unit
 
 
 class Result(TypedDict):
@@ -15,4 +16,29 @@ def test_subclass():
             return {"a": "b"}
     class TypedDictAllowed(AbsStateT2Unit):
         def process(self, compound, datapoints) -> Result:
-            return {"a": "b"}
\ No newline at end of file
+            return {"a": "b"}
+
+
+def test_process_many(mocker):
+    class FailingUnit(AbsStateT2Unit):
+        def process(self, compound, datapoints) -> dict[str, int]:
+            if not datapoints:
+                raise ValueError("no datapoints")
+            return {"n": len(datapoints)}
+
+    unit = FailingUnit(logger=mocker.MagicMock())
+    res = unit.process_many(
+        [({"link": 1}, [{"id": 1}]), ({"link": 2}, []), ({"link": 3}, [{"id": 1}, {"id": 2}])]  # type: ignore[typeddict-item]
+    )
+    assert res[0] == {"n": 1}
+    assert isinstance(res[1], ValueError)
+    assert res[2] == {"n": 2}
+
+
+def test_tied_process_many(mocker):
+    class TiedUnit(AbsTiedStateT2Unit):
+        def process(self, compound, datapoints, t2_views) -> dict[str, int]:
+            return {"n": len(t2_views)}
+
+    unit = TiedUnit(logger=mocker.MagicMock(), t2_dependency=[])
+    assert unit.process_many([({"link": 1}, [], [])]) == [{"n": 0}]  # type: ignore[typeddict-item]
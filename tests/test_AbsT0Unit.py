@@ -0,0 +1,29 @@
+from typing import Any
+
+import pytest
+
+from ampel.abstract.AbsT0Unit import AbsT0Unit
+from ampel.content.DataPoint import DataPoint
+from ampel.types import StockId
+
+
+class Shaper(AbsT0Unit):
+    def process(self, arg: Any, stock: None | StockId = None) -> list[DataPoint]:
+        return [
+            {"id": arg * 10 + i, "stock": stock or 0, "channel": [], "meta": [], "body": {}}
+            for i in range(arg)
+        ]
+
+
+def test_process_batch(mocker):
+    unit = Shaper(logger=mocker.MagicMock())
+    dps, offsets = unit.process_batch([2, 0, 3], [1, 2, None])
+    assert offsets == [0, 2, 2, 5]
+    assert [dp["id"] for dp in dps] == [20, 21, 30, 31, 32]
+    for i, arg in enumerate([2, 0, 3]):
+        assert dps[offsets[i] : offsets[i + 1]] == unit.process(arg, [1, 2, None][i])
+
+    assert unit.process_batch([]) == ([], [0])
+    assert unit.process_batch([1])[0][0]["stock"] == 0
+    with pytest.raises(ValueError, match="same length"):
+        unit.process_batch([1, 2], [1])
@@ -0,0 +1,40 @@
+from collections.abc import Iterable, Sequence
+
+from ampel.abstract.AbsT1CombineUnit import AbsT1CombineUnit
+from ampel.content.DataPoint import DataPoint
+from ampel.struct.T1CombineResult import T1CombineResult
+from ampel.types import DataPointId
+
+
+class PositiveIds(AbsT1CombineUnit):
+    def combine(self, datapoints: Iterable[DataPoint]) -> Sequence[DataPointId] | T1CombineResult:
+        return [dp["id"] for dp in datapoints if dp["id"] > 0]
+
+
+def dps(*ids: int) -> list[DataPoint]:
+    return [{"id": i, "channel": [], "meta": [], "body": {}} for i in ids]
+
+
+def test_fallback(mocker):
+    unit = PositiveIds(logger=mocker.MagicMock())
+    history = mocker.MagicMock(return_value=dps(1, -2, 3))
+    assert unit.combine_or_extend([1], dps(-2, 3), history) == [1, 3]
+    assert unit.combine_or_extend(None, dps(-2, 3), history) == [1, 3]
+    assert history.call_count == 2
+
+
+def test_incremental(mocker):
+    class IncrementalPositiveIds(PositiveIds):
+        def combine_incremental(
+            self, previous: Sequence[DataPointId] | T1CombineResult, datapoints: Iterable[DataPoint]
+        ) -> None | Sequence[DataPointId] | T1CombineResult:
+            if isinstance(previous, T1CombineResult):
+                return None
+            return [*previous, *self.combine(datapoints)]
+
+    unit = IncrementalPositiveIds(logger=mocker.MagicMock())
+    history = mocker.MagicMock(return_value=dps(1, -2, 3, 4))
+    assert unit.combine_or_extend([1, 3], dps(-5, 4), history) == [1, 3, 4]
+    history.assert_not_called()
+    assert unit.combine_or_extend(T1CombineResult(dps=[1, 3]), dps(4), history) == [1, 3, 4]
+    history.assert_called_once()
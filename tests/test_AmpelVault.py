@@ -98,3 +98,71 @@ def test_implicit_generic_args() -> None:
 
     annotation = cast(type[AmpelBaseModel], Foo.model_fields["seekrit"].annotation)
     assert annotation.get_model_args() == (dict,)
+
+
+class CountingProvider(DummySecretProvider):
+    def __init__(self, contents: dict[str, Any]) -> None:
+        super().__init__(contents)
+        self.calls: list[str] = []
+
+    def _tell(self, secret: Secret, ValueType: type) -> bool:
+        return isinstance(secret, NamedSecret) and secret.label in self.contents and super().tell(secret, ValueType)
+
+    def tell(self, secret: Secret, ValueType: type) -> bool:
+        self.calls.append("tell")
+        return self._tell(secret, ValueType)
+
+    def tell_many(self, args, ValueType: type) -> list[bool]:
+        self.calls.append("tell_many")
+        return [self._tell(secret, ValueType) for secret in args]
+
+
+def test_cache(mocker) -> None:
+    providers = [CountingProvider({"a": 1}), CountingProvider({"foo": "bar"})]
+    vault = AmpelVault(providers)  # type: ignore[arg-type]
+
+    for _ in range(3):
+        with NamedSecret.resolve_with(vault):
+            assert HasSecret.model_validate({"secret": {"label": "foo"}}).secret.get() == "bar"
+    assert (vault.hits, vault.misses, vault.provider_calls, vault.saved_calls) == (2, 1, 2, 4)
+    assert vault.get_named_secret("foo", int) is None
+    assert vault.get_named_secret("foo", int) is None
+    assert vault.misses == 3
+
+    # expired entries are resolved again
+    vault = AmpelVault(providers, ttl=10)  # type: ignore[arg-type]
+    monotonic = mocker.patch("ampel.secret.AmpelVault.monotonic", return_value=0)
+    assert vault.get_named_secret("a") is not None
+    monotonic.return_value = 5
+    assert vault.get_named_secret("a") is not None
+    monotonic.return_value = 11
+    assert vault.get_named_secret("a") is not None
+    assert (vault.hits, vault.misses) == (1, 2)
+
+
+def test_prefetch() -> None:
+    providers = [CountingProvider({"a": 1}), CountingProvider({"foo": "bar", "b": 2})]
+    vault = AmpelVault(providers)  # type: ignore[arg-type]
+    conf = {"unit": "X", "config": {"s": {"label": "foo"}, "l": [{"label": "a"}, {"label": "b"}, {"label": "c"}]}}
+    labels = AmpelVault.collect_labels(conf)
+    assert labels == {"foo", "a", "b", "c"}
+    assert vault.prefetch(sorted(labels)) == ["c"]
+    assert providers[0].calls == providers[1].calls == ["tell_many"]
+    assert vault.get_named_secret("b").get() == 2  # type: ignore[union-attr]
+    assert providers[1].calls == ["tell_many"]
+    assert (vault.hits, vault.saved_calls) == (1, 2)
+    assert vault.prefetch(["a", "b"]) == []
+    assert vault.provider_calls == 2
+
+
+def test_prefetch_typed() -> None:
+    provider = CountingProvider({"foo": "bar", "a": 1})
+    vault = AmpelVault([provider])
+    assert vault.prefetch(["foo", "a"]) == []
+    with NamedSecret.resolve_with(vault):
+        assert HasSecret.model_validate({"secret": {"label": "foo"}}).secret.get() == "bar"
+        # cached value with a mismatching type is not used
+        with pytest.raises(TypeError, match="Could not resolve secret 'a'"):
+            HasSecret.model_validate({"secret": {"label": "a"}})
+    assert provider.calls == ["tell_many", "tell"]
+    assert (vault.hits, vault.misses) == (1, 1)
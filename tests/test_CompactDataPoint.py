@@ -0,0 +1,63 @@
+import gc
+import pickle
+import sys
+
+import pytest
+
+from ampel.content.DataPoint import DataPoint
+from ampel.view.CompactDataPoint import CompactBody, CompactDataPoint
+
+
+@pytest.fixture
+def dps() -> list[DataPoint]:
+    return [
+        {
+            "id": i,
+            "stock": 12,
+            "channel": ["CHAN"],
+            "meta": [{"tier": 0, "code": 0}],
+            "body": {"jd": 2459000.5 + i, "magpsf": 18.0, "fid": 1},
+        }
+        for i in range(3)
+    ]
+
+
+def test_mapping(dps: list[DataPoint]):
+    cdps = CompactDataPoint.of_many(dps)
+    for dp, cdp in zip(dps, cdps, strict=True):
+        assert cdp.to_dict() == dp
+        assert dict(cdp) == dp
+        assert cdp["body"]["jd"] == dp["body"]["jd"]
+        assert "tag" not in cdp
+        assert cdp.get("tag") is None
+        with pytest.raises(KeyError):
+            cdp["excl"]
+        with pytest.raises(RuntimeError):
+            cdp.id = 0
+        assert cdp == dp
+    assert CompactDataPoint.of(cdps[0]) is cdps[0]
+    # key positions are shared between bodies
+    assert cdps[0].body._keys is cdps[1].body._keys
+    assert not hasattr(cdps[0], "__dict__")
+    assert sys.getsizeof(cdps[0].body) < sys.getsizeof(dps[0]["body"])
+
+
+def test_schema_release():
+    keys = ("unique_key_a", "unique_key_b")
+    body = CompactBody(dict.fromkeys(keys, 1))
+    assert keys in CompactBody._schemas
+    del body
+    gc.collect()
+    assert keys not in CompactBody._schemas
+
+
+def test_pickle(dps: list[DataPoint]):
+    cdp = CompactDataPoint.of(dps[0])
+    assert pickle.loads(pickle.dumps(cdp)) == cdp
+    body = CompactBody({"a": 1})
+    assert pickle.loads(pickle.dumps(body)) == body
+
+
+def test_unknown_key():
+    with pytest.raises(ValueError, match="Unknown datapoint keys"):
+        CompactDataPoint.of({"id": 0, "body": {}, "foo": 1})
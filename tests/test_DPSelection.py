@@ -0,0 +1,96 @@
+import random
+from collections.abc import Sequence
+from typing import Any
+
+import pytest
+
+from ampel.abstract.AbsApplicable import AbsApplicable
+from ampel.base.AuxUnitRegister import AuxUnitRegister
+from ampel.model.DPSelection import DPSelection
+from ampel.model.UnitModel import UnitModel
+from ampel.util.tag import DataPointTagIndex
+
+
+class EvenIdFilter(AbsApplicable):
+    def apply(self, arg: Any) -> Any:
+        return [el for el in arg if el["id"] % 2 == 0]
+
+
+class TagFilter(AbsApplicable):
+    require: Sequence[str] = ()
+    forbid: Sequence[str] = ()
+
+    def apply(self, arg: Any) -> Any:
+        return [
+            el
+            for el in arg
+            if all(t in el["tag"] for t in self.require) and not any(t in el["tag"] for t in self.forbid)
+        ]
+
+    def apply_many(self, args: Sequence[Any]) -> list[Any]:
+        return DataPointTagIndex(args).select(self.require, self.forbid)
+
+
+@pytest.fixture
+def filter_unit(monkeypatch):
+    monkeypatch.setitem(AuxUnitRegister._dyn, "EvenIdFilter", EvenIdFilter)
+    monkeypatch.setitem(AuxUnitRegister._dyn, "TagFilter", TagFilter)
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 200])
+@pytest.mark.parametrize("sort", ["id", "jd"])
+@pytest.mark.parametrize("select", ["first", "last", (None, 3, None), (1, -2, 5), (None, None, -1)])
+def test_apply(n, sort, select, filter_unit):
+    rng = random.Random(n)
+    dps = [
+        {"id": rng.randint(0, 1000), "body": {"jd": rng.choice([1, 2, 3, 2.5, rng.random()])}}
+        for _ in range(n)
+    ]
+    for flt in (None, "EvenIdFilter"):
+        sel = DPSelection(filter=flt, sort=sort, select=select)
+        f, so, sl = sel.tools()
+        assert so
+        expected = so(f.apply(dps) if f else dps)[sl]
+        assert expected == sorted(
+            f.apply(dps) if f else dps,
+            key=lambda dp: dp["id"] if sort == "id" else dp["body"][sort],
+        )[sl]
+        # compare identities as ties must be resolved as a stable sort would
+        assert [id(el) for el in sel.compile().apply(dps)] == [id(el) for el in expected]
+
+
+def test_compile_cache(filter_unit):
+    sel = DPSelection(filter=UnitModel(unit="EvenIdFilter"), sort="jd", select="last")
+    c = sel.compile()
+    assert isinstance(c.filter, EvenIdFilter)
+    assert DPSelection(filter="EvenIdFilter", sort="jd", select="last").compile() is not c
+    assert DPSelection(filter=UnitModel(unit="EvenIdFilter"), sort="jd", select=[None, -1, None]).compile() is not c
+    assert DPSelection(**sel.dict()).compile() is c
+    assert sel.tools()[0] is c.filter
+    assert DPSelection().tools()[1] is None
+
+
+def test_compile_dyn(filter_unit, monkeypatch):
+    sel = DPSelection(filter="EvenIdFilter")
+    c = sel.compile()
+    monkeypatch.setitem(AuxUnitRegister._dyn, "EvenIdFilter", TagFilter)
+    assert isinstance(sel.compile().filter, TagFilter)
+    assert sel.compile() is not c
+
+
+@pytest.mark.parametrize(
+    "config", [{}, {"require": ["A"]}, {"require": ["A", "B"], "forbid": ["C"]}, {"forbid": ["A", "D"]}]
+)
+def test_apply_many(config, filter_unit):
+    rng = random.Random(0)
+    batch = [
+        [
+            {"id": rng.randint(0, 1000), "tag": rng.sample(["A", "B", "C"], rng.randint(0, 3)), "body": {}}
+            for _ in range(rng.randint(0, 10))
+        ]
+        for _ in range(20)
+    ]
+    for sel in (DPSelection(filter=UnitModel(unit="TagFilter", config=config), sort="id", select=(None, 3, None)), DPSelection(select="last")):
+        c = sel.compile()
+        assert c.apply_many(batch) == [c.apply(dps) for dps in batch]
+    assert EvenIdFilter().apply_many(batch) == [EvenIdFilter().apply(dps) for dps in batch]
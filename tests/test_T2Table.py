@@ -0,0 +1,103 @@
+import pytest
+
+from ampel.model.T2ColumnModel import T2ColumnModel
+from ampel.view.SnapView import SnapView
+from ampel.view.T2DocView import T2DocView
+from ampel.view.T2Table import T2Table
+
+
+def t2_view(unit: str, stock: int, body: dict) -> T2DocView:
+    return T2DocView(
+        stock=stock,
+        unit=unit,
+        confid=None,
+        link=0,
+        tag=[],
+        code=0,
+        t2_type=0,
+        meta=[{"tier": 2, "code": 0}],
+        body=[body],
+    )
+
+
+@pytest.fixture
+def views() -> list[SnapView]:
+    return [
+        SnapView(
+            id=i,
+            t2=[
+                t2_view("T2SNCosmo", i, {"fit_result": {"z": 0.1 * i, "ndof": i}}),
+                t2_view("T2Other", i, {"flag": i % 2 == 0, "name": f"ZTF{i}"}),
+            ]
+            if i % 3
+            else [t2_view("T2NedSNCosmo", i, {"fit_result": {"z": None, "ndof": 1.5}})],
+        )
+        for i in range(10)
+    ] + [SnapView(id=10)]
+
+
+@pytest.fixture
+def columns() -> dict[str, T2ColumnModel]:
+    return {
+        "z": T2ColumnModel(unit=("T2NedSNCosmo", "T2SNCosmo"), path="fit_result.z"),
+        "ndof": T2ColumnModel(
+            unit=("T2NedSNCosmo", "T2SNCosmo"), path="fit_result.ndof", dtype="int"
+        ),
+        "flag": T2ColumnModel(unit="T2Other", path=("flag",), dtype="bool"),
+        "name": T2ColumnModel(unit="T2Other", path="name", dtype="str"),
+    }
+
+
+def test_list_backend(views, columns):
+    t = T2Table.of(views, columns, backend="list", batch_size=4)
+    assert len(t) == 11
+    assert t.stock == list(range(11))
+    assert t.null["z"] == [i % 3 == 0 for i in range(10)] + [True]
+    assert t.columns["z"][1] == pytest.approx(0.1)
+    # 1.5 is not an int
+    assert t.null["ndof"] == t.null["z"]
+    assert t.columns["ndof"][:3] == [0, 1, 2]
+    assert t.columns["flag"][:3] == [False, False, True]
+    assert t.columns["name"][:3] == [None, "ZTF1", "ZTF2"]
+
+
+def test_numpy_backend(views, columns):
+    np = pytest.importorskip("numpy")
+    t = T2Table.of(views, columns, batch_size=4)
+    ref = T2Table.of(views, columns, backend="list")
+    assert t.stock.dtype == np.int64
+    for k in columns:
+        assert t.null[k].tolist() == ref.null[k]
+        assert t.masked(k).tolist() == [
+            None if m else v for v, m in zip(ref.columns[k], ref.null[k], strict=True)
+        ]
+    assert np.isnan(t.columns["z"][0])
+    assert [len(b) for b in T2Table.iter_batches(views, columns, batch_size=4)] == [4, 4, 3]
+    empty = T2Table.of([], columns)
+    assert len(empty) == 0
+    assert empty.columns["z"].dtype == np.float64
+
+
+def test_reserved_column(views):
+    with pytest.raises(ValueError, match="reserved"):
+        T2Table.of(views, {"stock": {"unit": "T2SNCosmo", "path": "x"}})
+
+
+@pytest.mark.parametrize("backend", ["numpy", "list"])
+def test_to_arrow(views, columns, backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    pa = pytest.importorskip("pyarrow")
+    ref = T2Table.of(views, columns, backend="list")
+    table = T2Table.of(views, columns, backend=backend).to_arrow()
+    assert table.column_names == ["stock", "z", "ndof", "flag", "name"]
+    assert table.schema.field("ndof").type == pa.int64()
+    assert table.schema.field("flag").type == pa.bool_()
+    assert table.schema.field("name").type == pa.string()
+    assert table.column("stock").to_pylist() == list(range(11))
+    for k in columns:
+        col = table.column(k)
+        assert col.null_count == sum(ref.null[k])
+        assert col.to_pylist() == [
+            None if m else v for v, m in zip(ref.columns[k], ref.null[k], strict=True)
+        ]
@@ -0,0 +1,132 @@
+import os
+import pickle
+from datetime import datetime, timezone
+from math import isnan
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pytest
+
+from ampel.struct.T3Store import T3Store
+from ampel.struct.T3StoreSnapshot import T3StoreSnapshot
+from ampel.util.hash import build_unsafe_dict_id
+from ampel.view.T3DocView import T3DocView
+
+config = {"a": 1, "b": [1, 2]}
+
+
+def t3_view(unit: str, confid: int, code: int = 0) -> T3DocView:
+    return T3DocView(unit=unit, confid=confid, code=code, meta={})
+
+
+@pytest.fixture
+def store() -> T3Store:
+    return T3Store(
+        views=[
+            t3_view("A", 1),
+            t3_view("B", build_unsafe_dict_id(config)),
+            t3_view("A", 2, code=-1),
+            t3_view("B", 1),
+        ]
+    )
+
+
+def test_add_view(store: T3Store):
+    views = store.views
+    assert views is store.views
+    store.add_view(t3v := t3_view("C", 1))
+    assert store.views == (*views, t3v)
+    assert store.units == {"A", "B", "C"}
+    with pytest.raises(ValueError, match="read only"):
+        store.views = ()  # type: ignore[misc]
+    assert T3Store().views is None
+
+
+def test_get_views(store: T3Store):
+    views = store.views
+    assert views
+    assert list(store.get_views()) == list(views)
+    assert list(store.get_views("A")) == [views[0], views[2]]
+    assert list(store.get_views(config=1)) == [views[0], views[3]]
+    assert list(store.get_views(["A", "B"], config=[1, config])) == [views[0], views[1], views[3]]
+    assert store.get_view(config=config) is views[1]
+    assert store.get_view("A", code=-1) is views[2]
+    assert store.get_view("C") is None
+
+    # per call config dicts do not accumulate
+    for _ in range(1000):
+        assert store.get_view(config={"a": 1, "b": [1, 2]}) is views[1]
+    assert len(store._confids) <= T3Store.confid_cache_size
+
+    # modified config dicts are hashed again
+    q = {"a": 1, "b": [1, 2]}
+    assert store.get_view(config=q) is views[1]
+    q["b"].append(3)  # type: ignore[attr-defined]
+    assert store.get_view(config=q) is None
+    q["b"].pop()  # type: ignore[attr-defined]
+    assert store.get_view(config=q) is views[1]
+    with pytest.raises(ValueError, match="required"):
+        store.get_mandatory_view("B", code=-1)
+
+    # views added while iterating are not returned
+    it = store.get_views("A")
+    next(it)
+    store.add_view(t3_view("A", 3))
+    assert list(it) == [views[2]]
+
+
+def test_pickle(store: T3Store):
+    store.add_session_info({"run": 1})
+    store.extra["x"] = 1
+    t3s = pickle.loads(pickle.dumps(store))
+    assert t3s.views == store.views
+    assert t3s.session == {"run": 1}
+    assert t3s.extra == {"x": 1}
+    assert t3s.get_view(config=config) is t3s.views[1]  # type: ignore[index]
+    assert pickle.loads(pickle.dumps(T3Store())).views is None
+
+
+def run_unit(snap: T3StoreSnapshot) -> bytes:
+    t3s = snap.attach()
+    assert t3s.session == {"run": 1}
+    t3s.add_view(t3_view("W", len(t3s.views or ()), code=os.getpid()))
+    return snap.delta(t3s)
+
+
+def test_snapshot(store: T3Store, tmp_path):
+    store.add_session_info({"run": 1})
+    views = store.views
+    with T3StoreSnapshot.of(store, directory=str(tmp_path)) as snap:
+        assert pickle.loads(pickle.dumps(snap)).nviews == 4
+        with ProcessPoolExecutor(2, mp_context=get_context("spawn")) as pool:
+            deltas = list(pool.map(run_unit, [snap] * 2))
+        assert snap.attach().views == views
+        snap.merge(store, *deltas)
+    assert not os.listdir(tmp_path)
+    assert store.views
+    assert store.views[:4] == views
+    assert [(v.unit, v.confid) for v in store.views[4:]] == [("W", 4), ("W", 4)]
+    assert len(list(store.get_views("W"))) == 2
+
+
+def test_snapshot_roundtrip(tmp_path):
+    dt = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    view = T3DocView(
+        unit="A", confid=1, code=0, meta={}, config={1: "a"},
+        body={"t": dt, "x": float("nan"), "k": (1, 2)}
+    )
+    store = T3Store(views=[view, t3_view("B", 2)])
+    with T3StoreSnapshot.of(store, directory=str(tmp_path)) as snap:
+        t3s = snap.attach()
+        assert t3s.views
+        body = t3s.views[0].body
+        assert isinstance(body, dict)
+        assert body["t"] == dt
+        assert isnan(body["x"])
+        assert body["k"] == (1, 2)
+        assert t3s.views[0].config == {1: "a"}
+        assert [v.unit for v in snap.iter_views({"B"})] == ["B"]
+        t3s.add_view(view)
+        snap.merge(store, snap.delta(t3s))
+    assert store.views
+    assert store.views[2].body["k"] == (1, 2)  # type: ignore[index]
@@ -0,0 +1,85 @@
+import random
+from statistics import median
+
+import pytest
+
+from ampel.enum.JournalActionCode import JournalActionCode
+from ampel.enum.MetaActionCode import MetaActionCode
+
+np = pytest.importorskip("numpy")
+
+from ampel.util.activity import NA_INT, ActivityAggregator  # noqa: E402
+
+
+@pytest.fixture
+def stocks():
+    rng = random.Random(0)
+    actions = list(JournalActionCode)
+    return [
+        {
+            "stock": i,
+            "journal": [
+                {
+                    "tier": rng.choice([0, 2, 3]),
+                    "ts": 1000 + j,
+                    "run": rng.randint(1, 3),
+                    "process": rng.choice(["t0", "t2", "t3", 12]),
+                    "action": rng.choice(actions) | rng.choice(actions),
+                }
+                | ({"duration": rng.random()} if j % 4 else {})
+                for j in range(rng.randint(1, 20))
+            ],
+        }
+        for i in range(50)
+    ]
+
+
+def test_group_by(stocks):
+    agg = ActivityAggregator(chunk_size=64)
+    agg.add_stocks(stocks)
+    records = [(s["stock"], je) for s in stocks for je in s["journal"]]
+    assert len(agg) == len(records)
+
+    flag = JournalActionCode.T2_ADD_BODY
+    expected: dict = {}
+    for stock, je in records:
+        if je["action"] & flag:
+            expected.setdefault(je["run"], set()).add(stock)
+    assert agg.group_by("run", "stock", "nunique", where=agg.has_action(flag)) == {
+        k: len(v) for k, v in expected.items()
+    }
+
+    durations: dict = {}
+    for _, je in records:
+        if "duration" in je:
+            durations.setdefault(je["process"], []).append(je["duration"])
+    for reducer, func in (("median", median), ("max", max), ("min", min), ("sum", sum)):
+        res = agg.group_by("process", "duration", reducer)  # type: ignore[arg-type]
+        assert res.keys() == durations.keys()
+        assert res == pytest.approx({k: func(v) for k, v in durations.items()})
+
+    counts: dict = {}
+    for _, je in records:
+        counts[(je["tier"], je["run"])] = counts.get((je["tier"], je["run"]), 0) + 1
+    assert agg.group_by(("tier", "run")) == counts
+
+    decoded = agg.decode_actions()
+    assert (decoded["T2_ADD_BODY"] == agg.has_action(flag)).all()
+    assert agg.group_by("run", where=np.zeros(len(agg), dtype=bool)) == {}
+    with pytest.raises(ValueError, match="requires a value field"):
+        agg.group_by("run", reducer="sum")
+
+
+def test_meta():
+    agg = ActivityAggregator()
+    agg.add_meta(
+        1,
+        [
+            {"ts": 1, "tier": 2, "code": 0, "activity": [{"action": MetaActionCode.ADD_BODY}, {"action": MetaActionCode.SET_CODE}]},
+            {"ts": 2, "tier": 2},
+        ],
+    )
+    t = agg.table()
+    assert t["action"].tolist() == [MetaActionCode.ADD_BODY | MetaActionCode.SET_CODE, 0]
+    assert t["code"].tolist() == [0, NA_INT]
+    assert agg.group_by("code") == {NA_INT: 1, 0: 1}
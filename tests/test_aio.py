@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from ampel.abstract.AbsAsyncT3Unit import AbsAsyncT3Unit
+from ampel.abstract.AbsAsyncT4Unit import AbsAsyncT4Unit
+from ampel.struct.JournalAttributes import JournalAttributes
+from ampel.struct.StockAttributes import StockAttributes
+from ampel.struct.T3Store import T3Store
+from ampel.util.aio import AsyncViewStream, bounded_map, run_t3, run_t4
+from ampel.view.SnapView import SnapView
+
+
+class Publisher(AbsAsyncT3Unit):
+    async def process(self, views: AsyncViewStream, t3s: T3Store):
+        async def publish(view: SnapView) -> int:
+            await asyncio.sleep(0.01 * (view.id % 3))
+            return view.id
+
+        async def tagged():
+            async for view in views:
+                if view.id == 2:
+                    views.send(JournalAttributes(code=2))
+                yield view
+
+        return [res async for res in bounded_map(publish, tagged(), limit=4)]
+
+
+def test_run_t3(mocker):
+    unit = Publisher(logger=mocker.MagicMock())
+    res, updates = asyncio.run(run_t3(unit, [SnapView(id=i) for i in range(10)]))
+    assert res == list(range(10))
+    assert [(stock, ja.code) for stock, ja in updates] == [(2, 2)]  # type: ignore[union-attr]
+
+    stream = AsyncViewStream([SnapView(id=1)])
+    with pytest.raises(ValueError, match="provide a stock id"):
+        stream.send(JournalAttributes())
+    stream.send((5, StockAttributes(journal=JournalAttributes())))
+    assert stream.updates[0][0] == 5
+
+
+class ConcurrentPublisher(AbsAsyncT3Unit):
+    async def process(self, views: AsyncViewStream, t3s: T3Store):
+        async def publish(view: SnapView) -> int:
+            await asyncio.sleep(0.01 * (3 - view.id % 3))
+            views.send((view.id, StockAttributes(journal=JournalAttributes(code=view.id))))
+            with pytest.raises(ValueError, match="concurrent tasks"):
+                views.send(JournalAttributes(code=view.id))
+            return view.id
+
+        return [res async for res in bounded_map(publish, views, limit=4)]
+
+
+def test_send_concurrent(mocker):
+    unit = ConcurrentPublisher(logger=mocker.MagicMock())
+    res, updates = asyncio.run(run_t3(unit, [SnapView(id=i) for i in range(10)]))
+    assert res == list(range(10))
+    assert sorted((stock, sa.journal.code) for stock, sa in updates) == [(i, i) for i in range(10)]  # type: ignore[union-attr]
+
+
+def test_run_t4(mocker):
+    class Do(AbsAsyncT4Unit):
+        async def do(self):
+            return {"a": 1}
+
+    assert asyncio.run(run_t4(Do(logger=mocker.MagicMock()))) == {"a": 1}
+
+
+def test_signature():
+    with pytest.raises(TypeError, match="must be a coroutine"):
+
+        class Sync(AbsAsyncT4Unit):
+            def do(self):  # type: ignore[override]
+                return None
+
+    with pytest.raises(TypeError, match="Wrong method signature"):
+
+        class WrongSignature(AbsAsyncT3Unit):
+            async def process(self, views):  # type: ignore[override]
+                return None
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from ampel.util.compression import compress_many, decompress_many
+
+
+@pytest.fixture
+def members():
+    return {
+        f"plot_{i}.svg": os.urandom(64) + b"<svg>" * (i * 500) for i in range(8)
+    } | {"empty": b""}
+
+
+@pytest.mark.parametrize("alg", ["ZIP_DEFLATED", "ZIP_LZMA", "ZIP_BZIP2"])
+def test_compress_many_parallel(alg, members, mocker):
+    # zip members embed a timestamp
+    mocker.patch("time.time", return_value=1_600_000_000)
+    sequential = compress_many(members, alg)
+    parallel = compress_many(members, alg, max_workers=4)
+    assert parallel == sequential
+    assert decompress_many(parallel) == members
+    assert decompress_many(sequential, max_workers=4) == members
@@ -0,0 +1,49 @@
+import gc
+
+from ampel.struct.AmpelBuffer import AmpelBuffer
+from ampel.util.freeze import FreezePool, recursive_freeze
+from ampel.view.SnapView import SnapView
+
+
+def dp(i: int, **body) -> dict:
+    return {"id": i, "channel": ["A"], "meta": [{"tier": 0}], "body": {"x": [1, 2]} | body}
+
+
+def test_pool():
+    pool = FreezePool()
+    frozen = recursive_freeze(dp(1), pool)
+    assert frozen == recursive_freeze(dp(1))
+    assert recursive_freeze(dp(1), pool) is frozen
+    assert (pool.hits, pool.misses) == (1, 1)
+
+    # same id, different content
+    other = recursive_freeze(dp(1, y=1), pool)
+    assert other is not frozen
+    assert other["body"]["y"] == 1
+    assert recursive_freeze(dp(1, y=1.0), pool) is not other
+
+    # weak references
+    del frozen, other
+    gc.collect()
+    assert 1 not in pool
+
+
+def test_pool_lru():
+    pool = FreezePool(maxsize=2)
+    for i in range(3):
+        pool.freeze(dp(i))
+    gc.collect()
+    assert len(pool) == 2
+    assert 0 not in pool
+
+
+def test_snapview_pool():
+    pool = FreezePool()
+    views = [
+        SnapView.of(AmpelBuffer(id=i, t0=[dp(1), dp(i + 10)]), pool=pool)  # type: ignore[list-item]
+        for i in range(2)
+    ]
+    assert views[0].t0
+    assert views[1].t0
+    assert views[0].t0[0] is views[1].t0[0]
+    assert views[0].t0[1] is not views[1].t0[1]
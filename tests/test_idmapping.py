@@ -0,0 +1,75 @@
+from typing import ClassVar
+
+import pytest
+
+from ampel.abstract.AbsIdMapper import AbsIdMapper
+from ampel.util.idmapping import BidirectionalLRU, IdMapperCache, map_distinct
+
+
+class HexMapper(AbsIdMapper):
+    calls: ClassVar[list] = []
+
+    @classmethod
+    def to_ampel_id(cls, ext_id):  # type: ignore[override]
+        cls.calls.append(ext_id)
+        return int(ext_id, 16) if isinstance(ext_id, str) else [int(el, 16) for el in ext_id]
+
+    @classmethod
+    def to_ext_id(cls, ampel_id):  # type: ignore[override]
+        cls.calls.append(ampel_id)
+        return hex(ampel_id) if isinstance(ampel_id, int) else [hex(el) for el in ampel_id]  # type: ignore[union-attr]
+
+
+class CachedHexMapper(IdMapperCache, HexMapper):
+    id_cache_size: ClassVar[int] = 3
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    HexMapper.calls.clear()
+    CachedHexMapper.get_id_cache().clear()
+
+
+def test_batch():
+    assert HexMapper.to_ampel_ids(["0x2", "0x1", "0x2"]) == [2, 1, 2]
+    assert HexMapper.to_ext_ids([3, 2**70, 3]) == ["0x3", hex(2**70), "0x3"]
+    assert HexMapper.to_ext_ids([5, 4, 5, 5]) == ["0x5", "0x4", "0x5", "0x5"]
+    assert HexMapper.calls == [["0x2", "0x1", "0x2"], [3, 2**70, 3], [5, 4, 5, 5]]
+    assert HexMapper.to_ext_ids([]) == []
+
+
+def test_map_distinct():
+    calls = []
+
+    def f(v):
+        calls.append(v)
+        return [str(x) for x in v]
+
+    assert map_distinct(f, [1, "1", 1]) == ["1", "1", "1"]
+    assert map_distinct(f, [5, 4, 5, 2**70, 4]) == ["5", "4", "5", str(2**70), "4"]
+    assert map_distinct(f, [5, 4, 5]) == ["5", "4", "5"]
+    assert calls == [[1, "1"], [5, 4, 2**70], [4, 5]]
+
+
+def test_cache():
+    assert CachedHexMapper.to_ampel_ids(["0x1", "0x2", "0x1"]) == [1, 2, 1]
+    assert CachedHexMapper.to_ext_ids([1, 2, 3]) == ["0x1", "0x2", "0x3"]
+    assert HexMapper.calls == [["0x1", "0x2"], [3]]
+    cache = CachedHexMapper.get_id_cache()
+    assert (len(cache), cache.hits) == (3, 2)
+    CachedHexMapper.to_ext_ids([4])
+    assert cache.get_ext_id(1) is None
+    assert cache.get_ampel_id("0x1") is None
+    assert cache.get_ampel_id("0x4") == 4
+    assert HexMapper.__dict__.get("_id_cache") is None
+
+
+def test_lru():
+    lru = BidirectionalLRU(2)
+    lru.put(1, "a")
+    lru.put(2, "b")
+    lru.get_ampel_id("a")
+    lru.put(3, "c")
+    assert lru.get_ext_id(2) is None
+    lru.put(1, "d")
+    assert (lru.get_ampel_id("a"), lru.get_ampel_id("d"), len(lru)) == (None, 1, 2)
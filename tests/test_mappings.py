@@ -5,6 +5,7 @@ import pytest
 
 from ampel.config.AmpelConfig import AmpelConfig
 from ampel.util import mappings
+from ampel.util.hash import build_unsafe_dict_id
 
 
 @pytest.mark.parametrize(
@@ -66,3 +67,108 @@ def test_AmpelConfig_intify_on_load(key, section, tmp_path):
     assert ac.get([section, key], dict) is not None
     assert ac.get([section, int(key)], dict) is not None
     assert ac.get(f"{section}.{key}", dict) is not None
+
+
+NESTED = {"d": {"e": 1}, "a": [{"c": 2}, {"b": {"f": [3, 1, 2]}}]}
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        ({}, {"d.e": 1, "a": [{"c": 2}, {"b": {"f": [3, 1, 2]}}]}),
+        (
+            {"sort_keys": True, "flatten_list_members": True},
+            {"a": [{"c": 2}, {"b.f": [3, 1, 2]}], "d.e": 1},
+        ),
+        (
+            {"sort_keys": True, "flatten_list_members": True, "sort_lists": True},
+            {"a": [{"b.f": [1, 2, 3]}, {"c": 2}], "d.e": 1},
+        ),
+        (
+            {
+                "sort_keys": True,
+                "flatten_list_members": True,
+                "sort_lists": True,
+                "flatten_lists": True,
+            },
+            {"a.0.b.f.0": 1, "a.0.b.f.1": 2, "a.0.b.f.2": 3, "a.1.c": 2, "d.e": 1},
+        ),
+        ({"flatten_lists": True}, {"d.e": 1, "a.0.c": 2, "a.1.b.f.0": 3, "a.1.b.f.1": 1, "a.1.b.f.2": 2}),
+        ({"sort_keys": True}, {"a": [{"c": 2}, {"b": {"f": [3, 1, 2]}}], "d.e": 1}),
+    ],
+)
+def test_flatten_dict(kwargs, expected):
+    out = mappings.flatten_dict(NESTED, **kwargs)
+    # key order matters for hashing
+    assert list(out.items()) == list(expected.items())
+    assert list(mappings.iter_flatten_dict(NESTED, **kwargs)) == list(expected.items())
+
+
+def test_flatten_dict_errors():
+    with pytest.raises(ValueError, match="Offending input"):
+        mappings.flatten_dict({"a": {1: 1, "b": 2}}, sort_keys=True)
+    with pytest.raises(ValueError, match="Offending input"):
+        mappings.flatten_dict({"a": {1, 2}}, flatten_lists=True)
+
+
+def test_iter_flatten_dict_key_paths():
+    assert list(
+        mappings.iter_flatten_dict({"a": {"b": [1, {"c": 2}]}, 3: 4}, flatten_lists=True, key_paths=True)
+    ) == [(("a", "b", 0), 1), (("a", "b", 1, "c"), 2), ((3,), 4)]
+
+
+def test_unflatten_dict():
+    flat = {"a.0.b.f.0": 1, "a.0.b.f.1": 2, "a.0.b.f.2": 3, "a.1.c": 2, "d.e": 1}
+    assert mappings.unflatten_dict(flat, unflatten_list=True) == {
+        "a": [{"b": {"f": [1, 2, 3]}}, {"c": 2}],
+        "d": {"e": 1},
+    }
+    paths = dict(mappings.iter_flatten_dict({"a": {"b": 1}, "c": 2}, key_paths=True))
+    assert mappings.unflatten_dict(paths) == {"a": {"b": 1}, "c": 2}
+
+
+def test_build_unsafe_dict_id():
+    d = {"a": 1, "b": 2, "c": {"b": 3, "a": [1, 4]}}
+    assert build_unsafe_dict_id(d, size=32) == 2122149373
+    assert build_unsafe_dict_id(d, size=-64) == -8986814508490313900
+    assert build_unsafe_dict_id(d, size=128, ret=str) == "4ee95bc895cf7ef0ddac663121b2b911"
+    assert (
+        build_unsafe_dict_id({"b": 2, "a": 1, "c": {"b": 3, "a": [4, "r", 1]}}, size=32, ret=str)
+        == "ec94bc00"
+    )
+
+
+def test_compile_path():
+    cp = mappings.compile_path("foo.1_000.bar")
+    assert cp.keys == ("foo", 1000, "bar")
+    assert cp is mappings.compile_path("foo.1_000.bar")
+    assert mappings.get_by_path({"foo": {1000: {"bar": 1}}}, cp) == 1
+    with pytest.raises(ValueError, match="read only"):
+        cp.keys = ()  # type: ignore[misc]
+
+
+@pytest.mark.parametrize(
+    ("path", "value"),
+    [
+        ("body[-1].data[0]", ("data", {"a": 1})),
+        ("body[-1].data[0].a", ("a", 1)),
+        ("body.*", ("*", [{"data": [{"a": 1}]}])),
+        ("body[x]", None),
+        ("nonesuch.a", None),
+        ("id", ("id", 1)),
+    ],
+)
+def test_get_by_json_path(path, value):
+    d = {"id": 1, "body": [{"data": [{"a": 1}]}]}
+    assert mappings.get_by_json_path(d, path) == value
+    assert mappings.compile_path(path, json=True).get(d) == value
+
+
+def test_get_many():
+    docs = [{"a": {"b": 1}}, {"a": {}}, {"a": {"b": [2, 3]}}]
+    assert mappings.get_many(docs, "a.b") == [1, None, [2, 3]]
+    assert mappings.get_many(docs, mappings.compile_path("a.b[-1]", json=True)) == [
+        None,
+        None,
+        ("b", 3),
+    ]
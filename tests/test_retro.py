@@ -0,0 +1,42 @@
+import pytest
+
+from ampel.abstract.AbsT1RetroCombineUnit import AbsT1RetroCombineUnit
+from ampel.util.hash import hash_ids, iter_prefix_hashes
+from ampel.util.retro import PrefixView, iter_retro_states
+
+
+@pytest.mark.parametrize("size", [-64, 64, 32, 128])
+def test_prefix_hashes(size):
+    ids = [5, -(2**63), 2**63 - 1, 0, 42]
+    assert list(iter_prefix_hashes(ids, size=size)) == [hash_ids(ids[:i], size=size) for i in range(1, 6)]
+    assert list(iter_prefix_hashes(ids, [0, 2, 2, 5], size=size)) == [
+        hash_ids(ids[:i], size=size) for i in (0, 2, 2, 5)
+    ]
+    with pytest.raises(ValueError, match="Invalid prefix length"):
+        list(iter_prefix_hashes(ids, [3, 2]))
+
+
+def test_retro_states():
+    ids = (1, 2, 3, 4)
+    states = list(iter_retro_states(ids, ends=iter([2, 4])))
+    assert [(list(v), link) for v, link in states] == [([1, 2], hash_ids([1, 2])), ([1, 2, 3, 4], hash_ids(ids))]
+    assert all(v._ids is ids for v, _ in states)
+    assert [len(v) for v, _ in iter_retro_states(ids)] == [1, 2, 3, 4]
+
+    v = PrefixView(ids, 3)
+    assert v == [1, 2, 3]
+    assert v != [1, 2, 3, 4]
+    assert (v[-1], v[1:], v.index(2), 4 in v) == (3, [2, 3], 1, False)
+    with pytest.raises(IndexError):
+        v[3]
+
+
+def test_iter_combine(mocker):
+    class Retro(AbsT1RetroCombineUnit):
+        def combine(self, datapoints):
+            ids = [dp["id"] for dp in datapoints]
+            return [ids[: i + 1] for i in range(len(ids))]
+
+    unit = Retro(logger=mocker.MagicMock())
+    dps = [{"id": i} for i in range(3)]
+    assert list(unit.iter_combine(dps)) == unit.combine(dps)
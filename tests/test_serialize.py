@@ -0,0 +1,125 @@
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import IntEnum
+
+import pytest
+from bson import ObjectId
+
+from ampel.util import serialize
+from ampel.util.serialize import (
+    EncodingPlan,
+    decode_many,
+    encode_many,
+    walk_and_decode,
+    walk_and_encode,
+)
+
+
+class Code(IntEnum):
+    A = 1
+
+
+class Name(str):
+    pass
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+@pytest.fixture
+def doc():
+    return {
+        "_id": ObjectId("65200c8a5e1c2b4f8e6d0a11"),
+        "link": b"\x00\x01",
+        "body": [{"cutout": b"x", "n": 1}, {"n": 2}],
+        "meta": ({"tag": {"A"}},),
+    }
+
+
+@pytest.fixture
+def encoded():
+    return {
+        "_id": "oid:65200c8a5e1c2b4f8e6d0a11",
+        "link": "b64:AAE=",
+        "body": [{"cutout": "b64:eA==", "n": 1}, {"n": 2}],
+        "meta": [{"tag": ["A"]}],
+    }
+
+
+def test_walk_and_encode(doc, encoded):
+    assert walk_and_encode(doc, destructive=False) == encoded
+    assert isinstance(doc["link"], bytes)
+    assert walk_and_encode(doc) == encoded
+    assert doc["link"] == "b64:AAE="
+
+
+def test_walk_and_decode(doc, encoded):
+    decoded = walk_and_decode(encoded)
+    assert decoded["_id"] == doc["_id"]
+    assert decoded["link"] == doc["link"]
+    assert decoded["body"][0]["cutout"] == b"x"
+    assert walk_and_decode("oid:65200c8a5e1c2b4f8e6d0a11") == doc["_id"]
+    assert walk_and_decode(["b64:AAE=", "foo"]) == [b"\x00\x01", "foo"]
+
+
+def test_encoding_plan(doc, encoded):
+    plan = EncodingPlan.of(doc)
+    assert set(plan.paths) == {("_id",), ("link",), ("body", "*", "cutout")}
+    assert EncodingPlan(["_id", "link", "body.*.cutout"]).paths == plan.paths
+
+    out = walk_and_encode(doc, destructive=False, plan=plan)
+    assert out == encoded | {"meta": doc["meta"]}  # not part of the plan
+    assert doc["body"][0]["cutout"] == b"x"
+    assert out["body"][1] is doc["body"][1]  # copy-on-path only
+
+    assert walk_and_decode(out, plan=EncodingPlan.of(out)) == doc
+
+    assert EncodingPlan.for_schema("test_t2", doc) is EncodingPlan.for_schema("test_t2")
+    with pytest.raises(ValueError, match="No encoding plan"):
+        EncodingPlan.for_schema("nonesuch")
+
+
+def test_encode_many(doc, encoded):
+    docs = [doc, {"big": 2**70, 1: {b"a"}}, {}]
+    payload = encode_many(docs)
+    assert payload.count(b"\n") == 3
+    assert payload == encode_many(docs, fast=False)
+    assert decode_many(payload)[0] == doc | {"meta": [{"tag": ["A"]}]}
+    assert decode_many(payload, fast=False)[1:] == [{"big": 2**70, "1": [b"a"]}, {}]
+    assert json.loads(payload.splitlines()[0]) == encoded
+    assert isinstance(doc["link"], bytes)
+
+
+@pytest.mark.parametrize(
+    "doc",
+    [
+        {"a": 1e16, "b": [1e-7, 2.5], "c": "1e5"},
+        {"x": math.nan, "y": None, "z": [-math.inf]},
+        {1: 2, None: 3, 1.5: True},
+        {"e": Code.A, "s": Name("x")},
+        {"n": None, "f": 0.1},
+    ],
+)
+def test_encode_many_paths(doc):
+    assert encode_many([doc]) == encode_many([doc], fast=False)
+
+
+def test_encode_many_fast_path(mocker):
+    spy = mocker.spy(serialize, "_json_dumps")
+    docs = [{"_id": ObjectId("5e0e5e0e5e0e5e0e5e0e5e0e"), "b": b"\x00\x1e" * 8, "s": "1e5", "f": 0.5}]
+    assert b"0e" in encode_many(docs)
+    assert spy.call_count == 0
+    encode_many([{"f": 1e-7}])
+    assert spy.call_count == 1
+
+
+@pytest.mark.parametrize("doc", [{"t": datetime(2020, 1, 1, tzinfo=timezone.utc)}, {"d": Point(1, 2)}])
+def test_encode_many_unsupported(doc):
+    for fast in (True, False):
+        with pytest.raises(TypeError):
+            encode_many([doc], fast=fast)
@@ -9,11 +9,14 @@ from pydantic import TypeAdapter
 from typing_extensions import TypedDict
 
 from ampel.config.AmpelConfig import AmpelConfig
+from ampel.content.JournalRecord import JournalRecord
 from ampel.content.T2Document import T2Document
 from ampel.content.T3Document import T3Document
 from ampel.enum.DocumentCode import DocumentCode
+from ampel.enum.JournalActionCode import JournalActionCode
 from ampel.struct.AmpelBuffer import AmpelBuffer
 from ampel.types import strict_iterable
+from ampel.util.datapoints import stack_t0_columns
 from ampel.view.SnapView import SnapView
 from ampel.view.T2DocView import T2DocView
 from ampel.view.T3DocView import T3DocView
@@ -144,6 +147,28 @@ def test_get_payload(t2_view: T2DocView):
     assert_type(t2_view.get_payload(dict, raise_exc=True), Mapping[str, Any])
 
 
+def test_get_body_index(t2_doc: T2Document, config: AmpelConfig):
+    t2_doc["meta"] = [
+        {"tier": 2, "code": DocumentCode.OK},
+        {"tier": 1, "code": DocumentCode.OK},
+        {"tier": 2, "code": DocumentCode.T2_FAILED_DEPENDENCY},
+        {"tier": 2, "code": DocumentCode.OK},
+        {"tier": 2, "code": 12},
+    ]
+    t2_doc["body"] = [{"foo": 0}, {"foo": 1}]
+    view = T2DocView.of(t2_doc, config)
+    assert view.get_body_index(code=DocumentCode.T2_FAILED_DEPENDENCY) == 0
+    assert view.get_body_index(code=DocumentCode.ERROR) == -1
+    # clamped to the last body element
+    assert view.get_payload() == {"foo": 1}
+    assert view.get_payload(code=DocumentCode.OK) == {"foo": 1}
+    assert view.get_payload(code=12) == {"foo": 0}
+    assert view.get_payload(code=DocumentCode.ERROR) is None
+    # cached index is not part of the view's identity
+    assert view == T2DocView.of(t2_doc, config)
+    assert "_body_idx" not in TypeAdapter(T2DocView).dump_python(view)
+
+
 def test_get_t2_body(snap_view: SnapView):
     assert snap_view.get_t2_body("FooUnit") == {"foo": "bar"}
     assert snap_view.get_t2_body("nonesuch") is None
@@ -169,3 +194,73 @@ def test_snapview_subclass(buffer: AmpelBuffer, config: AmpelConfig):
     subview = SubView.of(buffer, config)
     assert subview.id == buffer["id"]
     assert subview.extra_thing == 2
+
+
+@pytest.fixture
+def lc_views() -> list[SnapView]:
+    return [
+        SnapView(
+            id=i,
+            t0=[
+                {"id": j, "channel": [], "meta": [], "body": body}
+                for j, body in enumerate(
+                    [
+                        {"jd": 3.0 + i, "magpsf": 18.0, "fid": 1},
+                        {"jd": 1.0 + i, "magpsf": 19.0, "fid": 2},
+                        {"jd": 2.0 + i, "diffmaglim": 20.0, "fid": 1},
+                    ][: i + 1]
+                )
+            ],
+        )
+        for i in range(3)
+    ]
+
+
+def test_get_t0_columns(lc_views: list[SnapView]):
+    np = pytest.importorskip("numpy")
+    view = lc_views[2]
+    cols = view.get_t0_columns(["magpsf", "fid"], sort="jd", dtype={"fid": "int8"})
+    assert cols["magpsf"].tolist() == [19.0, 18.0]
+    assert cols["fid"].dtype == np.int8
+    assert view.get_t0_columns(["magpsf", "fid"], sort="jd", dtype={"fid": "int8"}) is cols
+    with pytest.raises(ValueError, match="read-only"):
+        cols["magpsf"][0] = 0
+    arr = view.get_t0_columns(["jd", "fid"], output="structured")
+    assert arr.dtype.names == ("jd", "fid")
+    assert arr["jd"].tolist() == [5.0, 3.0, 4.0]
+    assert view.get_t0_columns(["jd"], output="list") == {"jd": (5.0, 3.0, 4.0)}
+    assert SnapView(id=0).get_t0_columns(["jd"])["jd"].size == 0
+
+
+def test_stack_t0_columns(lc_views: list[SnapView]):
+    pytest.importorskip("numpy")
+    cols, offsets = stack_t0_columns(lc_views, ["jd", "magpsf"], sort="jd")
+    assert offsets.tolist() == [0, 1, 3, 5]
+    assert cols["jd"].tolist() == [3.0, 2.0, 4.0, 3.0, 5.0]
+    arr, _ = stack_t0_columns(lc_views, ["jd", "magpsf"], output="structured")
+    assert arr["magpsf"][offsets[2] : offsets[3]].tolist() == [18.0, 19.0]
+
+
+def test_journal_index():
+    journal: list[JournalRecord] = [
+        {"tier": 0, "ts": 10, "process": "a", "action": JournalActionCode.T0_ADD_CHANNEL},
+        {"tier": 2, "ts": 30, "process": "b", "action": JournalActionCode.T2_ADD_BODY},
+        {"tier": 2, "ts": 20, "process": "c", "action": JournalActionCode.T2_ADD_TAG},
+        {"tier": 2, "ts": 40, "process": "b"},
+    ]
+    view = SnapView(id=0, stock={"stock": 0, "journal": journal})
+    ji = view.get_journal_index()
+    assert ji
+    assert ji is view.get_journal_index()
+    assert list(view.get_journal_entries(tier=2)) == journal[1:]
+    assert list(view.get_journal_entries(process_name="b", until=35)) == [journal[1]]
+    assert list(view.get_journal_entries(since=20, until=30)) == journal[1:3]
+    assert list(view.get_journal_entries(tier=2, since=20, filter_func=lambda je: "action" in je)) == journal[1:3]
+    assert view.get_time_created() == 10
+    assert view.get_time_updated() == 40
+    assert ji.get_actions(tier=2) == JournalActionCode.T2_ADD_BODY | JournalActionCode.T2_ADD_TAG
+    assert ji.get_actions(since=25) == JournalActionCode.T2_ADD_BODY
+    # selections do not expose the index
+    assert ji.select(tier=2) == (1, 2, 3)
+    assert ji.select(tier=2) is not ji.tiers[2]
+    assert SnapView(id=0).get_journal_index() is None